@@ -1,5 +1,6 @@
 using System;
 using System.Collections.Concurrent;
+using System.Diagnostics;
 using System.Net.Sockets;
 using System.Threading;
 using System.Threading.Tasks;
@@ -17,12 +18,17 @@ public class TcpCaptureService : ITcpCaptureService
     private NetworkStream? _stream;
     private CancellationTokenSource? _cts;
     private Task? _receiveTask;
-    private readonly object _lock = new();
+
+    // 64 КБ вмещают десятки блоков datiacquisiti, так что накопившиеся в сокете
+    // данные забираются одним чтением, а не порциями по 8 КБ
+    private const int ReceiveChunkSize = 65536;
     
     // Статистика
     private readonly CaptureStatistics _stats = new();
     private ulong _lastBytesCount;
-    private DateTime _lastStatsTime = DateTime.MinValue;
+    // Окно скорости меряется монотонными часами: перевод системного времени его не сбивает
+    private readonly Stopwatch _statsClock = Stopwatch.StartNew();
+    private long _lastStatsMs = -1;
     
     // Очереди pipeline
     private readonly IngestQueue _ingestQueue = new(10000);
@@ -32,27 +38,58 @@ public class TcpCaptureService : ITcpCaptureService
     private string _host = "192.168.0.214";
     private int _port = 55555;
     private int _connectionTimeoutMs = 5000;
-    private int _readTimeoutMs = 1000;
+    private int _socketReceiveBufferSize = 1 << 20;
 
     public int ConnectionTimeoutMs { get => _connectionTimeoutMs; set => _connectionTimeoutMs = value; }
+
+    /// <summary>
+    /// Размер приёмного буфера сокета (SO_RCVBUF), байт. Применяется при следующем подключении.
+    /// </summary>
+    public int SocketReceiveBufferSize { get => _socketReceiveBufferSize; set => _socketReceiveBufferSize = value; }
     
     public IReadOnlyList<NetworkInterfaceInfo> AvailableInterfaces { get; private set; } 
         = new List<NetworkInterfaceInfo>();
     
     public CaptureStatistics Statistics => _stats;
     
+    // Статус меняют цикл приёма, подключение и отключение из разных потоков:
+    // храним его в int и переключаем атомарно, _stats.Status — копия для чтения
+    private int _status = (int)ConnectionStatus.Disconnected;
+
     public ConnectionStatus Status
     {
-        get => _stats.Status;
+        get => (ConnectionStatus)Volatile.Read(ref _status);
         private set
         {
-            if (_stats.Status != value)
+            if (Interlocked.Exchange(ref _status, (int)value) != (int)value)
+                OnStatusChanged(value);
+        }
+    }
+
+    /// <summary>
+    /// Атомарно переводит сервис в Connecting, если он ещё не подключён и не подключается.
+    /// </summary>
+    private bool TryBeginConnecting()
+    {
+        while (true)
+        {
+            var current = Volatile.Read(ref _status);
+            if (current == (int)ConnectionStatus.Connected || current == (int)ConnectionStatus.Connecting)
+                return false;
+
+            if (Interlocked.CompareExchange(ref _status, (int)ConnectionStatus.Connecting, current) == current)
             {
-                _stats.Status = value;
-                StatusChanged?.Invoke(this, value);
+                OnStatusChanged(ConnectionStatus.Connecting);
+                return true;
             }
         }
     }
+
+    private void OnStatusChanged(ConnectionStatus value)
+    {
+        _stats.Status = value;
+        StatusChanged?.Invoke(this, value);
+    }
     
     public event EventHandler<byte[]>? DataReceived;
     public event EventHandler<ConnectionStatus>? StatusChanged;
@@ -106,17 +143,24 @@ public class TcpCaptureService : ITcpCaptureService
     {
         // Защита от двойного подключения: и Connected, и Connecting считаются занятыми.
         // Без этой проверки параллельные вызовы (авто-реконнект + ручной) создают
-        // два TcpClient, первый из которых утекает без Dispose.
-        if (Status == ConnectionStatus.Connected || Status == ConnectionStatus.Connecting)
+        // два TcpClient, первый из которых утекает без Dispose. Проверка и переход
+        // в Connecting — одна атомарная операция, иначе оба вызова проходят проверку.
+        if (!TryBeginConnecting())
             return;
 
         _host = host;
         _port = port;
-        Status = ConnectionStatus.Connecting;
         
         try
         {
-            _client = new TcpClient();
+            // Команды передатчику короткие и отправляются целым пакетом за один вызов —
+            // алгоритм Нейгла лишь задерживал бы их в ожидании подтверждения
+            _client = new TcpClient { NoDelay = true };
+
+            // Передатчик шлёт блоки с постоянным темпом; пока UI или диск притормаживают
+            // цикл чтения, пачка должна уместиться в ядре, а не упереть отправителя в окно TCP
+            if (_socketReceiveBufferSize > 0)
+                _client.ReceiveBufferSize = _socketReceiveBufferSize;
             _cts = new CancellationTokenSource();
             
             using var linkedCts = CancellationTokenSource.CreateLinkedTokenSource(ct, _cts.Token);
@@ -132,9 +176,9 @@ public class TcpCaptureService : ITcpCaptureService
             
             await connectTask;
             
+            // Таймауты чтения не задаём: приём и отправка асинхронные, а ожидающее
+            // чтение прерывается закрытием потока при отмене, а не опросом по таймауту
             _stream = _client.GetStream();
-            _stream.ReadTimeout = _readTimeoutMs;
-            _stream.WriteTimeout = _readTimeoutMs;
             
             Status = ConnectionStatus.Connected;
             
@@ -155,18 +199,15 @@ public class TcpCaptureService : ITcpCaptureService
         
         _cts?.Cancel();
         
-        if (_receiveTask != null)
+        var receiveTask = _receiveTask;
+        if (receiveTask != null)
         {
-            try
-            {
-                // Для .NET Framework 4.8 используем Task.Wait с таймаутом
-                await Task.Run(() =>
-                {
-                    try { _receiveTask?.Wait(TimeSpan.FromSeconds(2)); }
-                    catch (AggregateException) { }
-                }, ct);
-            }
-            catch (OperationCanceledException) { }
+            // Отмена закрывает поток, и цикл приёма завершается сразу; ждём его без
+            // блокировки потока пула, но не дольше 2 секунд. Таймер ожидания
+            // снимаем сразу после выхода, чтобы он не висел после каждого отключения.
+            using var delayCts = CancellationTokenSource.CreateLinkedTokenSource(ct);
+            await Task.WhenAny(receiveTask, Task.Delay(TimeSpan.FromSeconds(2), delayCts.Token)).ConfigureAwait(false);
+            delayCts.Cancel();
         }
         
         _stream?.Dispose();
@@ -183,59 +224,57 @@ public class TcpCaptureService : ITcpCaptureService
         if (_stream == null || Status != ConnectionStatus.Connected)
             throw new InvalidOperationException("Не подключено");
         
-        await Task.Run(() =>
-        {
-            _stream!.Write(data, 0, data.Length);
-            _stream.Flush();
-        }, ct);
+        // Один асинхронный вызов записи без переброски в пул потоков;
+        // Flush у NetworkStream ничего не делает — данные уходят в сокет сразу
+        await _stream.WriteAsync(data, 0, data.Length, ct).ConfigureAwait(false);
     }
     
     public async Task SendCommandAsync(string command, CancellationToken ct = default)
     {
-        var data = System.Text.Encoding.UTF8.GetBytes(command + "\r\n");
+        // Команда и CRLF кодируются сразу в итоговый массив — без промежуточной строки
+        var encoding = System.Text.Encoding.UTF8;
+        var data = new byte[encoding.GetByteCount(command) + 2];
+        var length = encoding.GetBytes(command, 0, command.Length, data, 0);
+        data[length] = (byte)'\r';
+        data[length + 1] = (byte)'\n';
         await SendAsync(data, ct);
     }
     
     private async Task ReceiveLoopAsync(CancellationToken ct)
     {
-        var buffer = new byte[8192];
-        
+        // Буфер свой у каждого цикла приёма: после быстрого реконнекта старый цикл
+        // может ещё дочитывать, и общий массив перетирал бы его данные
+        var buffer = new byte[ReceiveChunkSize];
+        var stream = _stream;
+        if (stream == null)
+            return;
+
+        // NetworkStream в .NET Framework не прерывает ожидающий ReadAsync по токену —
+        // при отмене закрываем поток, и чтение сразу завершается исключением
+        using var wake = ct.Register(() =>
+        {
+            try { stream.Close(); } catch { }
+        });
+
+        // Цикл приёма — единственный писатель счётчиков статистики
+        var totalBytes = _stats.TotalBytesReceived;
+        var totalPackets = _stats.TotalPacketsReceived;
+
         try
         {
             while (!ct.IsCancellationRequested && _client?.Connected == true)
             {
-                if (_stream == null)
-                    break;
-                
                 int bytesRead;
                 try
                 {
-                    // Для .NET Framework 4.8 используем синхронный Read в Task.Run
-                    bytesRead = await Task.Run(() =>
-                    {
-                        try
-                        {
-                            return _stream!.Read(buffer, 0, buffer.Length);
-                        }
-                        catch (IOException) when (ct.IsCancellationRequested)
-                        {
-                            return 0;
-                        }
-                        catch (IOException)
-                        {
-                            // Таймаут чтения — не разрыв соединения, продолжаем ожидание
-                            return -1;
-                        }
-                    }, ct);
+                    // Асинхронное чтение: ожидание данных не занимает поток пула
+                    bytesRead = await stream.ReadAsync(buffer, 0, buffer.Length, ct).ConfigureAwait(false);
                 }
-                catch (OperationCanceledException)
+                catch (Exception) when (ct.IsCancellationRequested)
                 {
                     break;
                 }
 
-                if (bytesRead == -1)
-                    continue; // Таймаут чтения — пробуем снова
-
                 if (bytesRead == 0)
                 {
                     // Удалённое закрытие соединения
@@ -243,21 +282,21 @@ public class TcpCaptureService : ITcpCaptureService
                     break;
                 }
                 
-                // Обновляем статистику
-                lock (_lock)
+                // Обновляем статистику: счётчики ведутся в локальных переменных цикла
+                // и только публикуются в _stats, без чтения свойств и без блокировки
+                totalBytes += (ulong)bytesRead;
+                totalPackets++;
+                _stats.TotalBytesReceived = totalBytes;
+                _stats.TotalPacketsReceived = totalPackets;
+                _stats.LastPacketTime = JsqClock.Now;
+
+                // Расчет скорости
+                var elapsedMs = _statsClock.ElapsedMilliseconds;
+                if (_lastStatsMs < 0 || elapsedMs - _lastStatsMs >= 1000)
                 {
-                    _stats.TotalBytesReceived += (ulong)bytesRead;
-                    _stats.TotalPacketsReceived++;
-                    _stats.LastPacketTime = JsqClock.Now;
-                    
-                    // Расчет скорости
-                    var now = JsqClock.Now;
-                    if ((now - _lastStatsTime).TotalSeconds >= 1)
-                    {
-                        _stats.BytesPerSecond = _stats.TotalBytesReceived - _lastBytesCount;
-                        _lastBytesCount = _stats.TotalBytesReceived;
-                        _lastStatsTime = now;
-                    }
+                    _stats.BytesPerSecond = totalBytes - _lastBytesCount;
+                    _lastBytesCount = totalBytes;
+                    _lastStatsMs = elapsedMs;
                 }
                 
                 // Копируем данные для подписчиков
@@ -17,6 +17,7 @@ public interface IConfigService
 /// </summary>
 public class JsonConfigService : IConfigService
 {
+    private static readonly JsonSerializerOptions IndentedJsonOptions = new() { WriteIndented = true };
     private readonly string _configPath;
     
     public JsonConfigService(string configPath = "jsq.config.json")
@@ -37,12 +38,7 @@ public class JsonConfigService : IConfigService
     
     public void Save(AppConfig config)
     {
-        var options = new JsonSerializerOptions
-        {
-            WriteIndented = true
-        };
-        
-        var json = JsonSerializer.Serialize(config, options);
+        var json = JsonSerializer.Serialize(config, IndentedJsonOptions);
         File.WriteAllText(_configPath, json);
     }
 }
@@ -11,9 +11,13 @@ public static class ChannelRegistry
 {
     private static readonly Dictionary<int, ChannelDefinition> _byIndex;
 
+    // Обёртка только для чтения создаётся один раз: All дёргается в горячих путях UI.
+    private static readonly ReadOnlyDictionary<int, ChannelDefinition> _all;
+
     static ChannelRegistry()
     {
         _byIndex = new Dictionary<int, ChannelDefinition>();
+        _all = new ReadOnlyDictionary<int, ChannelDefinition>(_byIndex);
 
         // --- Давление общее (посты A/B/C, индексы 0-5) ---
         Add(0,  "v000", "A-Pc",   "bara", "unit A - Discharge Pressure",   ChannelGroup.PostA, ChannelType.Pressure);
@@ -84,8 +88,7 @@ public static class ChannelRegistry
         Add(149, "v149", "SYS-4", "", "System channel 4", ChannelGroup.System, ChannelType.System);
     }
 
-    public static IReadOnlyDictionary<int, ChannelDefinition> All =>
-        new ReadOnlyDictionary<int, ChannelDefinition>(_byIndex);
+    public static IReadOnlyDictionary<int, ChannelDefinition> All => _all;
 
     /// <summary>Найти канал по протокольному индексу. Возвращает null если не найден.</summary>
     public static ChannelDefinition? GetByIndex(int index) =>
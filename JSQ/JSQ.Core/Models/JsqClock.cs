@@ -18,5 +18,27 @@ public static class JsqClock
     public static DateTime Now => DateTime.Now;
 
     public static string NowIso() =>
-        Now.ToString("yyyy-MM-dd HH:mm:ss.fffffff", CultureInfo.InvariantCulture);
+        Now.ToString(IsoFormat, CultureInfo.InvariantCulture);
+
+    private const string IsoFormat = "yyyy-MM-dd HH:mm:ss.fffffff";
+
+    // Форматы, в которых приложение само пишет время в БД: "O" (ToString("O"))
+    // и NowIso(). Для них разбор идёт по точному шаблону без перебора
+    // вариантов, которым занимается DateTime.TryParse.
+    private static readonly string[] StoredFormats = { "O", IsoFormat };
+
+    /// <summary>
+    /// Разбирает время, сохранённое приложением (формат "O" или NowIso()).
+    /// Сначала пробует точные форматы, затем общий разбор с RoundtripKind.
+    /// </summary>
+    public static bool TryParseStored(string? text, out DateTime value)
+    {
+        if (DateTime.TryParseExact(text, StoredFormats, CultureInfo.InvariantCulture,
+                DateTimeStyles.RoundtripKind, out value))
+        {
+            return true;
+        }
+
+        return DateTime.TryParse(text, null, DateTimeStyles.RoundtripKind, out value);
+    }
 }
@@ -1,5 +1,6 @@
 using System;
 using System.Collections.Generic;
+using System.Runtime.CompilerServices;
 using System.Text;
 using JSQ.Core.Models;
 
@@ -96,14 +97,24 @@ public class ChannelDecoder
     public static int[] BuildProtocolChannelOrder() =>
         (int[])ProtocolPositionToRegistryIndex.Clone();
 
-    private readonly List<byte> _buf = new List<byte>(16384);
+    private const int MaxBufferedBytes = 16384;
+    private const int DesyncKeepBytes = 512;
+
+    // Необработанные байты лежат в _buf[_head.._tail). Разобранные блоки не вырезаются
+    // из массива, а пропускаются сдвигом _head; сжатие — только когда кончается место в хвосте.
+    private byte[] _buf = new byte[MaxBufferedBytes];
+    private int _head;
+    private int _tail;
     private readonly object _sync = new object();
 
+    private int Buffered => _tail - _head;
+
     public void Reset()
     {
         lock (_sync)
         {
-            _buf.Clear();
+            _head = 0;
+            _tail = 0;
         }
     }
 
@@ -118,10 +129,15 @@ public class ChannelDecoder
             if (data == null || length <= 0)
                 return Array.Empty<ChannelValue>();
 
-            for (int i = 0; i < length; i++)
-                _buf.Add(data[i]);
+            Append(data, length);
+
+            // Список создаётся только при первом готовом кадре и сразу под полный блок,
+            // чтобы не перераспределять его по мере добавления 134 значений
+            List<ChannelValue>? result = null;
 
-            var result = new List<ChannelValue>();
+            // Байты удаляются только с головы буфера, поэтому если маркера нет,
+            // он не появится до следующего Feed — повторный поиск не нужен.
+            bool markerAbsent = false;
 
             bool progress;
             do
@@ -129,120 +145,174 @@ public class ChannelDecoder
                 progress = false;
 
                 // ── 1. Tagged (datiacquisiti) format ─────────────────────────
-                int markerPos = FindSequence(DatiMarker, 0);
+                int markerPos = markerAbsent ? -1 : FindSequence(DatiMarker, 0);
+                if (markerPos < 0)
+                    markerAbsent = true;
 
                 if (markerPos == 0)
                 {
                     // Marker at buffer head
-                    if (_buf.Count < DatiBlockSize)
+                    if (Buffered < DatiBlockSize)
                         break; // wait for rest of block
 
                     long channelCount = ReadUInt32BE(DatiCountOffset);
                     if (channelCount == DatiExpectedCount)
                     {
                         var now = JsqClock.Now;
+                        result ??= new List<ChannelValue>(DatiExpectedCount);
                         for (int i = 0; i < DatiExpectedCount; i++)
                         {
                             double val = ReadFloat64BE(DatiValuesOffset + i * 8);
                             if (IsNoData(val)) val = double.NaN;
                             result.Add(new ChannelValue(ProtocolPositionToRegistryIndex[i], val, now));
                         }
-                        _buf.RemoveRange(0, DatiBlockSize);
+                        _head += DatiBlockSize;
                         progress = true;
                     }
                     else
                     {
                         // Marker found but block malformed — advance past it
-                        _buf.RemoveAt(0);
+                        _head++;
                         progress = true;
                     }
                 }
                 else if (markerPos > 0)
                 {
                     // Skip leading non-tagged bytes (other protocol frames between blocks)
-                    _buf.RemoveRange(0, markerPos);
+                    _head += markerPos;
                     progress = true;
                 }
                 else
                 {
                     // ── 2. Legacy (binary) format — fallback for unit tests ───
-                    if (_buf.Count < MinLegacyPacketSize)
+                    if (Buffered < MinLegacyPacketSize)
                         break;
 
                     long totalLength = ReadUInt32BE(0);
                     if (totalLength < 28 || totalLength > 65536)
                     {
-                        _buf.RemoveAt(0);
+                        _head++;
                         progress = true;
                         continue;
                     }
 
                     int fullSize = (int)(4 + totalLength);
-                    if (_buf.Count < fullSize)
+                    if (Buffered < fullSize)
                         break;
 
                     long count = ReadUInt32BE(24);
                     long expectedTotal = 20 + 4 + count * 8 + 4;
                     if (count > MaxChannels || totalLength != expectedTotal)
                     {
-                        _buf.RemoveAt(0);
+                        _head++;
                         progress = true;
                         continue;
                     }
 
                     // No position mapping for legacy — indices are sequential
                     var now = JsqClock.Now;
+                    result ??= new List<ChannelValue>((int)count);
                     for (int i = 0; i < (int)count; i++)
                     {
                         double val = ReadFloat64BE(28 + i * 8);
                         if (IsNoData(val)) val = double.NaN;
                         result.Add(new ChannelValue(i, val, now));
                     }
-                    _buf.RemoveRange(0, fullSize);
+                    _head += fullSize;
                     progress = true;
                 }
 
-            } while (progress && _buf.Count > 0);
+            } while (progress && Buffered > 0);
 
             // Guard against buffer bloat on sustained desync
-            if (_buf.Count > 16384)
-                _buf.RemoveRange(0, _buf.Count - 512);
+            if (Buffered > MaxBufferedBytes)
+                _head = _tail - DesyncKeepBytes;
+
+            if (_head == _tail)
+            {
+                _head = 0;
+                _tail = 0;
+            }
+
+            return (IReadOnlyList<ChannelValue>?)result ?? Array.Empty<ChannelValue>();
+        }
+    }
+
+    /// <summary>
+    /// Дописывает байты в хвост буфера. Непрочитанный остаток переносится в начало массива
+    /// только когда в хвосте не хватает места; массив растёт, если не хватает и после этого.
+    /// </summary>
+    private void Append(byte[] data, int length)
+    {
+        if (_tail + length > _buf.Length)
+        {
+            int buffered = Buffered;
+            if (buffered + length > _buf.Length)
+            {
+                var grown = new byte[Math.Max(_buf.Length * 2, buffered + length)];
+                Buffer.BlockCopy(_buf, _head, grown, 0, buffered);
+                _buf = grown;
+            }
+            else if (buffered > 0)
+            {
+                Buffer.BlockCopy(_buf, _head, _buf, 0, buffered);
+            }
 
-            return result;
+            _head = 0;
+            _tail = buffered;
         }
+
+        Buffer.BlockCopy(data, 0, _buf, _tail, length);
+        _tail += length;
     }
 
+    /// <summary>
+    /// Ищет последовательность в необработанных байтах; смещения — относительно _head.
+    /// </summary>
     private int FindSequence(byte[] seq, int startIndex)
     {
-        int limit = _buf.Count - seq.Length;
-        for (int i = startIndex; i <= limit; i++)
+        int limit = _tail - seq.Length;
+        byte first = seq[0];
+        int i = _head + startIndex;
+        while (i <= limit)
         {
+            // Быстрый поиск первого байта маркера, полное сравнение — только на кандидатах
+            i = Array.IndexOf(_buf, first, i, limit - i + 1);
+            if (i < 0) return -1;
+
             bool match = true;
-            for (int j = 0; j < seq.Length; j++)
+            for (int j = 1; j < seq.Length; j++)
             {
                 if (_buf[i + j] != seq[j]) { match = false; break; }
             }
-            if (match) return i;
+            if (match) return i - _head;
+            i++;
         }
         return -1;
     }
 
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
     private long ReadUInt32BE(int offset)
     {
+        offset += _head;
         return ((long)_buf[offset]     << 24) |
                ((long)_buf[offset + 1] << 16) |
                ((long)_buf[offset + 2] <<  8) |
                (long)_buf[offset + 3];
     }
 
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
     private double ReadFloat64BE(int offset)
     {
-        byte[] bytes = new byte[8];
+        // Собираем 64-битный образ прямо из буфера, без промежуточного byte[8]
+        offset += _head;
+        long bits = 0;
         for (int i = 0; i < 8; i++)
-            bytes[7 - i] = _buf[offset + i];
-        return BitConverter.ToDouble(bytes, 0);
+            bits = (bits << 8) | _buf[offset + i];
+        return BitConverter.Int64BitsToDouble(bits);
     }
 
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
     private static bool IsNoData(double val) =>
         Math.Abs(val - NoDataSentinel) < NoDataTolerance;
 }
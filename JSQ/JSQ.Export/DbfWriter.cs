@@ -9,6 +9,8 @@ namespace JSQ.Export;
 
 internal static class DbfWriter
 {
+    private const int WriteBufferSize = 64 * 1024;
+
     public static void Write(
         string path,
         IReadOnlyList<DbfField> fields,
@@ -19,135 +21,225 @@ internal static class DbfWriter
         var headerLength = (short)(32 + (fields.Count * 32) + 1);
         var recordLength = (short)(1 + fields.Sum(f => f.Length));
 
-        using var fs = new FileStream(path, FileMode.Create, FileAccess.Write, FileShare.None);
-        using var writer = new BinaryWriter(fs, Encoding.ASCII, leaveOpen: false);
-
-        WriteHeader(writer, rows.Count, headerLength, recordLength, fileDate);
-        foreach (var field in fields)
-        {
-            WriteFieldDescriptor(writer, field);
-        }
+        using var fs = new FileStream(path, FileMode.Create, FileAccess.Write, FileShare.None, WriteBufferSize);
 
-        writer.Write((byte)0x0D);
+        // Заголовок и дескрипторы полей собираются в одном буфере и пишутся одним вызовом.
+        var header = BuildHeader(fields, rows.Count, headerLength, recordLength, fileDate);
+        fs.Write(header, 0, header.Length);
 
+        // Один буфер записи на весь файл: поля кодируются в него по смещениям, запись — одним вызовом.
+        var slots = BuildSlots(fields, channels);
+        var record = new byte[recordLength];
         foreach (var row in rows)
         {
-            WriteRecord(writer, fields, row, channels);
+            FillRecord(record, slots, row);
+            fs.Write(record, 0, record.Length);
         }
 
-        writer.Write((byte)0x1A);
+        fs.WriteByte(0x1A);
     }
 
-    private static void WriteHeader(BinaryWriter writer, int recordCount, short headerLength, short recordLength, DateTime fileDate)
+    private static byte[] BuildHeader(
+        IReadOnlyList<DbfField> fields,
+        int recordCount,
+        short headerLength,
+        short recordLength,
+        DateTime fileDate)
     {
-        writer.Write((byte)0x03); // dBase III
-        writer.Write((byte)(fileDate.Year - 1900));
-        writer.Write((byte)fileDate.Month);
-        writer.Write((byte)fileDate.Day);
-        writer.Write(recordCount);
-        writer.Write(headerLength);
-        writer.Write(recordLength);
-
-        for (var i = 0; i < 20; i++)
+        // Буфер нулевой: зарезервированные байты заголовка и дескрипторов не заполняются.
+        var header = new byte[headerLength];
+
+        header[0] = 0x03; // dBase III
+        header[1] = (byte)(fileDate.Year - 1900);
+        header[2] = (byte)fileDate.Month;
+        header[3] = (byte)fileDate.Day;
+        WriteInt32LE(header, 4, recordCount);
+        WriteInt16LE(header, 8, headerLength);
+        WriteInt16LE(header, 10, recordLength);
+
+        var offset = 32;
+        foreach (var field in fields)
         {
-            writer.Write((byte)0x00);
+            WriteFieldDescriptor(header, offset, field);
+            offset += 32;
         }
+
+        header[offset] = 0x0D;
+        return header;
+    }
+
+    private static void WriteFieldDescriptor(byte[] header, int offset, DbfField field)
+    {
+        var name = TrimFieldName(field.Name);
+        Encoding.ASCII.GetBytes(name, 0, name.Length, header, offset);
+
+        header[offset + 11] = (byte)field.Type;
+        header[offset + 16] = field.Length;
+        header[offset + 17] = field.DecimalCount;
     }
 
-    private static void WriteFieldDescriptor(BinaryWriter writer, DbfField field)
+    private static void WriteInt32LE(byte[] buffer, int offset, int value)
     {
-        var fieldNameBytes = Encoding.ASCII.GetBytes(TrimFieldName(field.Name));
-        var nameBuffer = new byte[11];
-        Array.Copy(fieldNameBytes, nameBuffer, Math.Min(fieldNameBytes.Length, nameBuffer.Length));
-
-        writer.Write(nameBuffer);
-        writer.Write((byte)field.Type);
-        writer.Write((byte)0x00);
-        writer.Write((byte)0x00);
-        writer.Write((byte)0x00);
-        writer.Write((byte)0x00);
-        writer.Write(field.Length);
-        writer.Write(field.DecimalCount);
-
-        for (var i = 0; i < 14; i++)
+        buffer[offset] = (byte)value;
+        buffer[offset + 1] = (byte)(value >> 8);
+        buffer[offset + 2] = (byte)(value >> 16);
+        buffer[offset + 3] = (byte)(value >> 24);
+    }
+
+    private static void WriteInt16LE(byte[] buffer, int offset, short value)
+    {
+        buffer[offset] = (byte)value;
+        buffer[offset + 1] = (byte)(value >> 8);
+    }
+
+    /// <summary>
+    /// Раскладка полей считается один раз на файл: тип значения, смещение в записи
+    /// и колонка канала. Запись строк дальше идёт без сравнения имён полей.
+    /// </summary>
+    private static FieldSlot[] BuildSlots(IReadOnlyList<DbfField> fields, IReadOnlyList<LegacyChannel> channels)
+    {
+        var columnByName = new Dictionary<string, int>(channels.Count, StringComparer.Ordinal);
+        for (var i = channels.Count - 1; i >= 0; i--)
         {
-            writer.Write((byte)0x00);
+            columnByName[channels[i].Name] = i;
         }
+
+        var slots = new FieldSlot[fields.Count];
+        var offset = 1; // байт 0 — флаг удаления записи
+        for (var i = 0; i < fields.Count; i++)
+        {
+            var field = fields[i];
+            var kind = field.Name switch
+            {
+                "Data" => FieldKind.Date,
+                "Ore" => FieldKind.Hour,
+                "Minuti" => FieldKind.Minute,
+                "Secondi" => FieldKind.Second,
+                "mSecondi" => FieldKind.Millisecond,
+                _ => FieldKind.Channel
+            };
+
+            var column = -1;
+            if (kind == FieldKind.Channel && !columnByName.TryGetValue(field.Name, out column))
+            {
+                throw new InvalidOperationException($"DBF field '{field.Name}' has no matching export channel.");
+            }
+
+            slots[i] = new FieldSlot(field, kind, offset, column);
+            offset += field.Length;
+        }
+
+        return slots;
     }
 
-    private static void WriteRecord(
-        BinaryWriter writer,
-        IReadOnlyList<DbfField> fields,
-        ExportSampleRow row,
-        IReadOnlyList<LegacyChannel> channels)
+    private static void FillRecord(byte[] record, FieldSlot[] slots, ExportSampleRow row)
     {
-        writer.Write((byte)0x20); // active record
+        record[0] = 0x20; // active record
 
-        foreach (var field in fields)
+        foreach (var slot in slots)
         {
-            string raw;
+            var field = slot.Field;
+            var timestamp = row.Timestamp;
 
-            switch (field.Name)
+            // Поля даты и времени пишутся цифрами прямо в буфер записи, без промежуточных строк.
+            switch (slot.Kind)
             {
-                case "Data":
-                    raw = row.Timestamp.ToString("yyyyMMdd", CultureInfo.InvariantCulture);
+                case FieldKind.Date:
+                    EnsureLength(field, 8);
+                    WriteZeroPadded(record, slot.Offset, timestamp.Year, 4);
+                    WriteZeroPadded(record, slot.Offset + 4, timestamp.Month, 2);
+                    WriteZeroPadded(record, slot.Offset + 6, timestamp.Day, 2);
                     break;
-                case "Ore":
-                    raw = FormatInteger(row.Timestamp.Hour, field.Length);
+                case FieldKind.Hour:
+                    WriteInteger(record, slot, timestamp.Hour);
                     break;
-                case "Minuti":
-                    raw = FormatInteger(row.Timestamp.Minute, field.Length);
+                case FieldKind.Minute:
+                    WriteInteger(record, slot, timestamp.Minute);
                     break;
-                case "Secondi":
-                    raw = FormatInteger(row.Timestamp.Second, field.Length);
+                case FieldKind.Second:
+                    WriteInteger(record, slot, timestamp.Second);
                     break;
-                case "mSecondi":
-                    raw = FormatInteger(row.Timestamp.Millisecond, field.Length);
+                case FieldKind.Millisecond:
+                    WriteInteger(record, slot, timestamp.Millisecond);
                     break;
                 default:
-                    raw = FormatChannelValue(field, row, channels);
+                    WriteNumeric(record, slot, row.Values[slot.Column]);
                     break;
             }
+        }
+    }
 
-            var bytes = Encoding.ASCII.GetBytes(raw);
-            if (bytes.Length != field.Length)
-            {
-                throw new InvalidOperationException($"DBF field '{field.Name}' expected length {field.Length}, got {bytes.Length}.");
-            }
+    /// <summary>
+    /// Целое без знака, выровненное вправо пробелами (как PadLeft).
+    /// </summary>
+    private static void WriteInteger(byte[] record, FieldSlot slot, int value)
+    {
+        var digits = CountDigits(value);
+        EnsureLength(slot.Field, Math.Max(digits, slot.Field.Length));
+
+        var end = slot.Offset + slot.Field.Length;
+        for (var i = slot.Offset; i < end - digits; i++)
+        {
+            record[i] = (byte)' ';
+        }
+
+        WriteZeroPadded(record, end - digits, value, digits);
+    }
 
-            writer.Write(bytes);
+    private static void WriteZeroPadded(byte[] record, int offset, int value, int width)
+    {
+        for (var i = offset + width - 1; i >= offset; i--)
+        {
+            record[i] = (byte)('0' + value % 10);
+            value /= 10;
         }
     }
 
-    private static string FormatChannelValue(DbfField field, ExportSampleRow row, IReadOnlyList<LegacyChannel> channels)
+    private static int CountDigits(int value)
     {
-        var channel = channels.First(c => c.Name == field.Name);
-        if (!row.ValuesByChannel.TryGetValue(channel.Index, out var value))
+        var digits = 1;
+        while (value >= 10)
         {
-            value = -99;
+            value /= 10;
+            digits++;
         }
 
-        return FormatNumeric(value, field.Length, field.DecimalCount);
+        return digits;
     }
 
-    private static string FormatInteger(int value, byte width)
+    private static void EnsureLength(DbfField field, int actualLength)
     {
-        return value.ToString(CultureInfo.InvariantCulture).PadLeft(width, ' ');
+        if (actualLength != field.Length)
+        {
+            throw new InvalidOperationException($"DBF field '{field.Name}' expected length {field.Length}, got {actualLength}.");
+        }
     }
 
-    private static string FormatNumeric(double value, byte width, byte decimals)
+    /// <summary>
+    /// Число с фиксированной точкой, выровненное вправо пробелами; не влезает в поле — звёздочки.
+    /// Строка формата берётся из раскладки, выравнивание делается прямо в буфере записи.
+    /// </summary>
+    private static void WriteNumeric(byte[] record, FieldSlot slot, double value)
     {
-        var format = decimals > 0
-            ? $"F{decimals}"
-            : "F0";
-
-        var text = value.ToString(format, CultureInfo.InvariantCulture);
+        var width = slot.Field.Length;
+        var text = value.ToString(slot.NumericFormat, CultureInfo.InvariantCulture);
         if (text.Length > width)
         {
-            return new string('*', width);
+            for (var i = 0; i < width; i++)
+            {
+                record[slot.Offset + i] = (byte)'*';
+            }
+
+            return;
+        }
+
+        var pad = width - text.Length;
+        for (var i = 0; i < pad; i++)
+        {
+            record[slot.Offset + i] = (byte)' ';
         }
 
-        return text.PadLeft(width, ' ');
+        Encoding.ASCII.GetBytes(text, 0, text.Length, record, slot.Offset + pad);
     }
 
     private static string TrimFieldName(string name)
@@ -159,4 +251,32 @@ internal static class DbfWriter
 
         return name.Substring(0, 11);
     }
+
+    private enum FieldKind
+    {
+        Date,
+        Hour,
+        Minute,
+        Second,
+        Millisecond,
+        Channel
+    }
+
+    private sealed class FieldSlot
+    {
+        public FieldSlot(DbfField field, FieldKind kind, int offset, int column)
+        {
+            Field = field;
+            Kind = kind;
+            Offset = offset;
+            Column = column;
+            NumericFormat = "F" + field.DecimalCount.ToString(CultureInfo.InvariantCulture);
+        }
+
+        public DbfField Field { get; }
+        public FieldKind Kind { get; }
+        public int Offset { get; }
+        public int Column { get; }
+        public string NumericFormat { get; }
+    }
 }
@@ -57,5 +57,9 @@ internal class ExportSampleRow
 {
     public DateTime Timestamp { get; set; }
     public string TimestampKey { get; set; } = string.Empty;
-    public System.Collections.Generic.Dictionary<int, double> ValuesByChannel { get; } = new();
+
+    /// <summary>
+    /// Значения по колонкам в порядке списка каналов экспорта; -99 — нет данных.
+    /// </summary>
+    public double[] Values { get; set; } = Array.Empty<double>();
 }
@@ -25,6 +25,9 @@ public class LegacyExportService : ILegacyExportService
         "B-Tc", "B-Te", "B-T1", "B-T2", "B-T3", "B-T4", "B-T5", "B-T6", "B-T7", "B-T8"
     };
 
+    // Позиция канала в PreferredOrder по имени — сортировка не ищет линейно по массиву.
+    private static readonly Dictionary<string, int> PreferredRank = BuildPreferredRank();
+
     private readonly IDatabaseService _dbService;
 
     public LegacyExportService(IDatabaseService dbService)
@@ -139,7 +142,7 @@ public class LegacyExportService : ILegacyExportService
         List<RawSampleRow> sampleRows)
     {
         var channels = BuildChannelList(sampleRows);
-        var records = BuildRecords(sampleRows);
+        var records = BuildRecords(sampleRows, channels);
 
         var finalPackageDir = Path.Combine(outputRoot, packageName);
         var tmpPackageDir = Path.Combine(outputRoot, $".tmp_{packageName}_{Guid.NewGuid():N}");
@@ -157,11 +160,27 @@ public class LegacyExportService : ILegacyExportService
         var tmpDefPath = Path.Combine(tmpSetDir, "Canali.def");
         var tmpCalPath = Path.Combine(tmpSetDir, "Canali.cal");
 
-        WriteDbf(tmpDbfPath, channels, records);
-        WriteDat(tmpDatPath, meta);
-        WriteIni(tmpIniPath);
-        WriteDef(tmpDefPath, channels);
-        WriteCal(tmpCalPath, channels);
+        // Файлы пакета независимы: служебные пишутся в фоне, пока основной поток пишет DBF.
+        var sideFilesTask = Task.Run(() =>
+        {
+            WriteDat(tmpDatPath, meta);
+            WriteIni(tmpIniPath);
+            WriteDef(tmpDefPath, channels);
+            WriteCal(tmpCalPath, channels);
+        });
+
+        try
+        {
+            WriteDbf(tmpDbfPath, channels, records);
+        }
+        catch
+        {
+            // Наружу уходит ошибка DBF; фоновую запись дожидаемся, чтобы она не осталась без наблюдения.
+            try { sideFilesTask.Wait(); } catch { }
+            throw;
+        }
+
+        sideFilesTask.GetAwaiter().GetResult();
 
         Directory.CreateDirectory(outputRoot);
         if (Directory.Exists(finalPackageDir))
@@ -224,23 +243,37 @@ public class LegacyExportService : ILegacyExportService
         return channels;
     }
 
-    private static List<ExportSampleRow> BuildRecords(List<RawSampleRow> sampleRows)
+    private static List<ExportSampleRow> BuildRecords(List<RawSampleRow> sampleRows, IReadOnlyList<LegacyChannel> channels)
     {
+        // Значения строки хранятся плотным массивом по колонкам DBF, а не словарём по индексу канала.
+        var columnByChannel = new Dictionary<int, int>(channels.Count);
+        for (var i = 0; i < channels.Count; i++)
+        {
+            columnByChannel[channels[i].Index] = i;
+        }
+
         var recordsByTimestamp = new Dictionary<string, ExportSampleRow>(StringComparer.Ordinal);
 
         foreach (var sample in sampleRows)
         {
             if (!recordsByTimestamp.TryGetValue(sample.Timestamp, out var row))
             {
+                var values = new double[channels.Count];
+                for (var i = 0; i < values.Length; i++)
+                {
+                    values[i] = -99;
+                }
+
                 row = new ExportSampleRow
                 {
                     TimestampKey = sample.Timestamp,
-                    Timestamp = ParseTimestamp(sample.Timestamp)
+                    Timestamp = ParseTimestamp(sample.Timestamp),
+                    Values = values
                 };
                 recordsByTimestamp[sample.Timestamp] = row;
             }
 
-            row.ValuesByChannel[sample.ChannelIndex] = sample.IsValid == 1 ? sample.Value : -99;
+            row.Values[columnByChannel[sample.ChannelIndex]] = sample.IsValid == 1 ? sample.Value : -99;
         }
 
         return recordsByTimestamp.Values
@@ -251,7 +284,7 @@ public class LegacyExportService : ILegacyExportService
 
     private static DateTime ParseTimestamp(string text)
     {
-        if (DateTime.TryParse(text, null, DateTimeStyles.RoundtripKind, out var parsed))
+        if (JsqClock.TryParseStored(text, out var parsed))
         {
             return parsed;
         }
@@ -261,8 +294,21 @@ public class LegacyExportService : ILegacyExportService
 
     private static int PreferredIndex(string channelName)
     {
-        var idx = Array.IndexOf(PreferredOrder, channelName);
-        return idx >= 0 ? idx : int.MaxValue;
+        return PreferredRank.TryGetValue(channelName, out var idx) ? idx : int.MaxValue;
+    }
+
+    private static Dictionary<string, int> BuildPreferredRank()
+    {
+        var rank = new Dictionary<string, int>(PreferredOrder.Length, StringComparer.Ordinal);
+        for (var i = 0; i < PreferredOrder.Length; i++)
+        {
+            if (!rank.ContainsKey(PreferredOrder[i]))
+            {
+                rank[PreferredOrder[i]] = i;
+            }
+        }
+
+        return rank;
     }
 
     private static (byte length, byte decimals) ResolveDbfNumericFormat(string channelName, ChannelType? type)
@@ -292,7 +338,7 @@ public class LegacyExportService : ILegacyExportService
         Directory.CreateDirectory(outputRoot);
 
         var max = 0;
-        foreach (var dir in Directory.GetDirectories(outputRoot, "Prova*"))
+        foreach (var dir in Directory.EnumerateDirectories(outputRoot, "Prova*"))
         {
             var name = Path.GetFileName(dir);
             if (TryParseProvaNumber(name, out var n) && n > max)
@@ -319,8 +365,13 @@ public class LegacyExportService : ILegacyExportService
             return false;
         }
 
-        var numeric = new string(name.Skip(5).TakeWhile(char.IsDigit).ToArray());
-        return int.TryParse(numeric, NumberStyles.None, CultureInfo.InvariantCulture, out number);
+        var end = 5;
+        while (end < name.Length && char.IsDigit(name[end]))
+        {
+            end++;
+        }
+
+        return int.TryParse(name.Substring(5, end - 5), NumberStyles.None, CultureInfo.InvariantCulture, out number);
     }
 
     private static void WriteDbf(string path, IReadOnlyList<LegacyChannel> channels, IReadOnlyList<ExportSampleRow> rows)
@@ -400,29 +451,28 @@ public class LegacyExportService : ILegacyExportService
 
     private static void WriteDef(string path, IReadOnlyList<LegacyChannel> channels)
     {
-        var lines = new List<string> { channels.Count.ToString(CultureInfo.InvariantCulture) };
+        // Содержимое собирается в одном буфере, без промежуточных массивов и строк на каждую строку файла.
+        var content = new StringBuilder(64 * (channels.Count + 1));
+        content.Append(channels.Count.ToString(CultureInfo.InvariantCulture)).Append("\r\n");
 
         foreach (var channel in channels)
         {
             var profile = ResolveDefProfile(channel);
-            lines.Add(string.Join(";", new[]
-            {
-                channel.Name,
-                channel.Description,
-                NormalizeUnit(channel.Unit),
-                profile.precision.ToString(CultureInfo.InvariantCulture),
-                profile.scale.ToString(CultureInfo.InvariantCulture),
-                profile.min.ToString(CultureInfo.InvariantCulture),
-                profile.offset1.ToString(CultureInfo.InvariantCulture),
-                profile.offset2.ToString(CultureInfo.InvariantCulture),
-                profile.offset3.ToString(CultureInfo.InvariantCulture),
-                profile.divisor.ToString(CultureInfo.InvariantCulture),
-                "0"
-            }));
+            content
+                .Append(channel.Name).Append(';')
+                .Append(channel.Description).Append(';')
+                .Append(NormalizeUnit(channel.Unit)).Append(';')
+                .Append(profile.precision.ToString(CultureInfo.InvariantCulture)).Append(';')
+                .Append(profile.scale.ToString(CultureInfo.InvariantCulture)).Append(';')
+                .Append(profile.min.ToString(CultureInfo.InvariantCulture)).Append(';')
+                .Append(profile.offset1.ToString(CultureInfo.InvariantCulture)).Append(';')
+                .Append(profile.offset2.ToString(CultureInfo.InvariantCulture)).Append(';')
+                .Append(profile.offset3.ToString(CultureInfo.InvariantCulture)).Append(';')
+                .Append(profile.divisor.ToString(CultureInfo.InvariantCulture)).Append(';')
+                .Append('0').Append("\r\n");
         }
 
-        var content = string.Join("\r\n", lines) + "\r\n";
-        File.WriteAllText(path, content, Encoding.GetEncoding(1252));
+        File.WriteAllText(path, content.ToString(), Encoding.GetEncoding(1252));
     }
 
     private static (int precision, int scale, int min, int offset1, int offset2, int offset3, int divisor) ResolveDefProfile(LegacyChannel channel)
@@ -459,15 +509,20 @@ public class LegacyExportService : ILegacyExportService
 
     private static void WriteCal(string path, IReadOnlyList<LegacyChannel> channels)
     {
-        var lines = new List<string>(channels.Count);
+        var zero = FormatScientific(0);
+        var content = new StringBuilder(96 * channels.Count);
         foreach (var channel in channels)
         {
             var (min, max) = ResolveCalibrationRange(channel.Name);
-            lines.Add($"{channel.Name};;{FormatScientific(min)};{FormatScientific(max)};{FormatScientific(0)};{FormatScientific(0)};;");
+            content
+                .Append(channel.Name).Append(";;")
+                .Append(FormatScientific(min)).Append(';')
+                .Append(FormatScientific(max)).Append(';')
+                .Append(zero).Append(';')
+                .Append(zero).Append(";;\r\n");
         }
 
-        var content = string.Join("\r\n", lines) + "\r\n";
-        File.WriteAllText(path, content, Encoding.GetEncoding(1252));
+        File.WriteAllText(path, content.ToString(), Encoding.GetEncoding(1252));
     }
 
     private static string FormatScientific(double value)
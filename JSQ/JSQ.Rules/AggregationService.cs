@@ -15,6 +15,11 @@ public interface IAggregationService
     /// Добавить измерение для агрегации
     /// </summary>
     void AddSample(Sample sample);
+
+    /// <summary>
+    /// Добавить измерения одного кадра
+    /// </summary>
+    void AddSamples(IReadOnlyList<Sample> samples);
     
     /// <summary>
     /// Получить готовые агрегированные данные
@@ -84,6 +89,44 @@ public class AggregationService : IAggregationService
             _totalSamples++;
         }
     }
+
+    public void AddSamples(IReadOnlyList<Sample> samples)
+    {
+        if (samples.Count == 0)
+            return;
+
+        // Сэмплы кадра делят метку времени: начала окон считаются один раз на метку,
+        // а блокировка берётся один раз на кадр, а не на каждый канал
+        var windowsTimestamp = default(DateTime);
+        var regularStart = default(DateTime);
+        var highPrecisionStart = default(DateTime);
+        var haveStarts = false;
+
+        lock (_lock)
+        {
+            for (var i = 0; i < samples.Count; i++)
+            {
+                var sample = samples[i];
+                if (!haveStarts || sample.Timestamp != windowsTimestamp)
+                {
+                    windowsTimestamp = sample.Timestamp;
+                    regularStart = GetWindowStart(windowsTimestamp, _intervalSeconds);
+                    highPrecisionStart = GetWindowStart(windowsTimestamp, _highPrecisionIntervalSeconds);
+                    haveStarts = true;
+                }
+
+                var highPrecision = _highPrecisionChannels.Contains(sample.ChannelIndex);
+                var window = _windows.GetOrAdd(sample.ChannelIndex, _ => new WindowState())
+                    .GetOrCreateWindow(
+                        highPrecision ? highPrecisionStart : regularStart,
+                        highPrecision ? _highPrecisionIntervalSeconds : _intervalSeconds);
+
+                window.AddValue(sample.Value);
+            }
+
+            _totalSamples += samples.Count;
+        }
+    }
     
     public IEnumerable<AggregatedValue> GetReadyAggregates()
     {
@@ -232,9 +275,15 @@ public class AggregationService : IAggregationService
     /// </summary>
     private class AggregationWindow
     {
-        private readonly List<double> _values = new();
+        // Окну нужны только итоговые статистики — значения не храним,
+        // а ведём их накопительно (память окна не растёт с частотой опроса).
+        private int _count;
         private double _sum;
         private double _sumSquares;
+        private double _min;
+        private double _max;
+        private double _first;
+        private double _last;
         
         public DateTime WindowStart { get; }
         public int IntervalSeconds { get; }
@@ -255,7 +304,21 @@ public class AggregationService : IAggregationService
                 return;
             }
             
-            _values.Add(value);
+            if (_count == 0)
+            {
+                _min = value;
+                _max = value;
+                _first = value;
+            }
+            else
+            {
+                // Сравнения повторяют Enumerable.Min/Max для NaN
+                if (value < _min || double.IsNaN(value)) _min = value;
+                if (value > _max || double.IsNaN(_max)) _max = value;
+            }
+
+            _last = value;
+            _count++;
             _sum += value;
             _sumSquares += value * value;
         }
@@ -269,11 +332,11 @@ public class AggregationService : IAggregationService
         
         public AggregatedValue? ToAggregatedValue(int channelIndex)
         {
-            if (_values.Count == 0)
+            if (_count == 0)
                 return null;
             
-            var avg = _sum / _values.Count;
-            var variance = (_sumSquares / _values.Count) - (avg * avg);
+            var avg = _sum / _count;
+            var variance = (_sumSquares / _count) - (avg * avg);
             var stddev = variance > 0 ? Math.Sqrt(variance) : (double?)null;
             
             return new AggregatedValue
@@ -282,14 +345,14 @@ public class AggregationService : IAggregationService
                 WindowSeconds = IntervalSeconds,
                 WindowStart = WindowStart,
                 WindowEnd = WindowStart.AddSeconds(IntervalSeconds),
-                Min = _values.Min(),
-                Max = _values.Max(),
+                Min = _min,
+                Max = _max,
                 Avg = avg,
-                First = _values.First(),
-                Last = _values.Last(),
-                SampleCount = _values.Count,
+                First = _first,
+                Last = _last,
+                SampleCount = _count,
                 InvalidCount = InvalidCount,
-                TotalCount = _values.Count + InvalidCount,
+                TotalCount = _count + InvalidCount,
                 QualityFlag = CalculateQualityFlag(),
                 StdDev = stddev
             };
@@ -298,7 +361,7 @@ public class AggregationService : IAggregationService
         private int CalculateQualityFlag()
         {
             // Качество: 1 = OK, 0 = degraded (>10% invalid), -1 = bad (>50% invalid)
-            var total = _values.Count + InvalidCount;
+            var total = _count + InvalidCount;
             if (total == 0)
                 return -1;
             
@@ -52,7 +52,9 @@ public class AnomalyDetector : IAnomalyDetector
                 // Инициализируем LastCheckTime = now, чтобы NoData-таймаут начал отсчёт
                 // с момента загрузки правил, а не с первого пакета данных.
                 // Это позволяет обнаружить мёртвый канал, который никогда не присылал данных.
-                _channelStates[rule.ChannelIndex] = new ChannelState { LastCheckTime = now };
+                var state = CreateState(rule);
+                state.LastCheckTime = now;
+                _channelStates[rule.ChannelIndex] = state;
             }
         }
     }
@@ -68,25 +70,24 @@ public class AnomalyDetector : IAnomalyDetector
         }
     }
 
-    private List<AnomalyEvent> CheckValueLocked(int channelIndex, AnomalyRule rule, double value, DateTime timestamp)
+    private IEnumerable<AnomalyEvent> CheckValueLocked(int channelIndex, AnomalyRule rule, double value, DateTime timestamp)
     {
-        var events = new List<AnomalyEvent>();
-        var state = _channelStates.GetOrAdd(channelIndex, _ => new ChannelState());
+        // Подавляющее большинство значений событий не порождает —
+        // список создаётся только при первом событии.
+        List<AnomalyEvent>? events = null;
+        var state = _channelStates.GetOrAdd(channelIndex, _ => CreateState(rule));
 
         // Проверка минимума
-        if (rule.MinLimit.HasValue)
+        if (state.EffectiveMin.HasValue)
         {
-            var hysteresis = rule.MinHysteresis ?? 0;
-            var effectiveMin = rule.MinLimit.Value - hysteresis;
-
-            if (value < effectiveMin)
+            if (value < state.EffectiveMin.Value)
             {
                 state.MinViolationCount++;
                 if (state.MinViolationCount >= rule.DebounceCount && !state.HasActiveMinViolation)
                 {
                     var evt = CreateEvent(channelIndex, rule.ChannelName, AnomalyType.MinViolation,
                         value, rule.MinLimit, $"Значение {value:F3} ниже минимума {rule.MinLimit:F3}");
-                    events.Add(evt);
+                    (events ??= new List<AnomalyEvent>()).Add(evt);
                     state.HasActiveMinViolation = true;
                 }
             }
@@ -101,26 +102,23 @@ public class AnomalyDetector : IAnomalyDetector
                     {
                         var restored = CreateEvent(channelIndex, rule.ChannelName, AnomalyType.LimitsRestored,
                             value, rule.MinLimit, $"Значение {value:F3} вернулось в пределы (мин {rule.MinLimit:F3})");
-                        events.Add(restored);
+                        (events ??= new List<AnomalyEvent>()).Add(restored);
                     }
                 }
             }
         }
 
         // Проверка максимума
-        if (rule.MaxLimit.HasValue)
+        if (state.EffectiveMax.HasValue)
         {
-            var hysteresis = rule.MaxHysteresis ?? 0;
-            var effectiveMax = rule.MaxLimit.Value + hysteresis;
-
-            if (value > effectiveMax)
+            if (value > state.EffectiveMax.Value)
             {
                 state.MaxViolationCount++;
                 if (state.MaxViolationCount >= rule.DebounceCount && !state.HasActiveMaxViolation)
                 {
                     var evt = CreateEvent(channelIndex, rule.ChannelName, AnomalyType.MaxViolation,
                         value, rule.MaxLimit, $"Значение {value:F3} выше максимума {rule.MaxLimit:F3}");
-                    events.Add(evt);
+                    (events ??= new List<AnomalyEvent>()).Add(evt);
                     state.HasActiveMaxViolation = true;
                 }
             }
@@ -135,7 +133,7 @@ public class AnomalyDetector : IAnomalyDetector
                     {
                         var restored = CreateEvent(channelIndex, rule.ChannelName, AnomalyType.LimitsRestored,
                             value, rule.MaxLimit, $"Значение {value:F3} вернулось в пределы (макс {rule.MaxLimit:F3})");
-                        events.Add(restored);
+                        (events ??= new List<AnomalyEvent>()).Add(restored);
                     }
                 }
             }
@@ -150,7 +148,7 @@ public class AnomalyDetector : IAnomalyDetector
                 var evt = CreateEvent(channelIndex, rule.ChannelName, AnomalyType.DeltaSpike,
                     value, rule.MaxDelta, $"Скачок значения: Δ={delta:F3} (макс. {rule.MaxDelta:F3})",
                     delta);
-                events.Add(evt);
+                (events ??= new List<AnomalyEvent>()).Add(evt);
             }
         }
 
@@ -164,10 +162,10 @@ public class AnomalyDetector : IAnomalyDetector
             state.HasNoDataEvent = false;
             var recovery = CreateEvent(channelIndex, rule.ChannelName, AnomalyType.DataRestored,
                 value, null, $"Данные восстановлены: {rule.ChannelName}");
-            events.Add(recovery);
+            (events ??= new List<AnomalyEvent>()).Add(recovery);
         }
 
-        return events;
+        return events ?? (IEnumerable<AnomalyEvent>)Array.Empty<AnomalyEvent>();
     }
 
     public IEnumerable<AnomalyEvent> CheckAggregate(AggregatedValue aggregate)
@@ -207,7 +205,7 @@ public class AnomalyDetector : IAnomalyDetector
                 if (!rule.NoDataTimeoutSec.HasValue)
                     continue;
 
-                var state = _channelStates.GetOrAdd(rule.ChannelIndex, _ => new ChannelState());
+                var state = _channelStates.GetOrAdd(rule.ChannelIndex, _ => CreateState(rule));
 
                 if (state.LastCheckTime.HasValue)
                 {
@@ -301,8 +299,21 @@ public class AnomalyDetector : IAnomalyDetector
         }
     }
 
+    /// <summary>
+    /// Пороги с учётом гистерезиса не меняются, пока действует правило, —
+    /// считаются один раз при создании состояния, а не на каждое значение.
+    /// </summary>
+    private static ChannelState CreateState(AnomalyRule rule) => new ChannelState
+    {
+        EffectiveMin = rule.MinLimit - (rule.MinHysteresis ?? 0),
+        EffectiveMax = rule.MaxLimit + (rule.MaxHysteresis ?? 0)
+    };
+
     private class ChannelState
     {
+        public double? EffectiveMin { get; set; }
+        public double? EffectiveMax { get; set; }
+
         public double? LastValue { get; set; }
         public DateTime? LastCheckTime { get; set; }
 
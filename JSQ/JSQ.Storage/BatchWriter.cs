@@ -20,7 +20,8 @@ public interface IBatchWriter : IDisposable
     void AddBatch(string experimentId, SampleBatch batch);
     
     /// <summary>
-    /// Принудительно записать все данные
+    /// Принудительно записать все данные. Завершается с ошибкой, если часть
+    /// измерений записать не удалось (они остаются в очереди или отброшены).
     /// </summary>
     Task FlushAsync(CancellationToken ct = default);
     
@@ -38,6 +39,10 @@ public class BatchWriterStatistics
     public ulong TotalSamplesWritten { get; set; }
     public ulong TotalBatchesWritten { get; set; }
     public ulong DroppedSamples { get; set; }
+    /// <summary>
+    /// Измерения, принятые, но ещё не записанные в БД
+    /// </summary>
+    public int PendingSamples { get; set; }
     public DateTime LastWriteTime { get; set; }
     public TimeSpan AvgWriteDuration { get; set; }
 }
@@ -47,13 +52,24 @@ public class BatchWriterStatistics
 /// </summary>
 public class BatchWriter : IBatchWriter
 {
+    // Столько раз подряд пакет может не записаться, прежде чем будет отброшен:
+    // иначе один «битый» пакет навсегда блокирует очередь, а новые данные теряются
+    private const int MaxWriteAttempts = 5;
+
     private readonly IDatabaseService _dbService;
     private readonly int _batchSize;
     private readonly TimeSpan _flushInterval;
     
-    private readonly List<SampleToWrite> _buffer = new();
+    private List<SampleToWrite> _buffer = new();
     private readonly object _lock = new();
     private DateTime _lastFlushTime = DateTime.MinValue;
+
+    // Заполненные пакеты ждут записи здесь. Пишет их один фоновый воркер, поэтому
+    // транзакция SQLite не выполняется в потоке, вызвавшем AddSamples (цикл приёма TCP).
+    private readonly List<PendingBatch> _pending = new();
+    private int _pendingSamples;
+    private bool _flushRunning;
+    private Task _flushTask = Task.CompletedTask;
     private readonly BatchWriterStatistics _stats = new();
     private readonly Stopwatch _writeTimer = new();
     
@@ -66,20 +82,31 @@ public class BatchWriter : IBatchWriter
     
     public void AddSamples(string experimentId, IEnumerable<Sample> samples)
     {
+        // Сэмплы кадра делят метку времени — строка "O" форматируется один раз на метку
+        var formattedAt = default(DateTime);
+        string? timestamp = null;
+
         lock (_lock)
         {
             foreach (var sample in samples)
             {
-                if (_buffer.Count >= _batchSize * 10) // Max buffer protection
+                if (_buffer.Count + _pendingSamples >= _batchSize * 10) // Max buffer protection
                 {
                     _stats.DroppedSamples++;
                     continue;
                 }
 
+                if (timestamp == null || sample.Timestamp != formattedAt ||
+                    sample.Timestamp.Kind != formattedAt.Kind)
+                {
+                    formattedAt = sample.Timestamp;
+                    timestamp = formattedAt.ToString("O");
+                }
+
                 _buffer.Add(new SampleToWrite
                 {
                     ExperimentId = experimentId,
-                    Timestamp = sample.Timestamp.ToString("O"),
+                    Timestamp = timestamp,
                     ChannelIndex = sample.ChannelIndex,
                     Value = sample.Value,
                     IsValid = sample.IsValid
@@ -90,7 +117,7 @@ public class BatchWriter : IBatchWriter
             if (_buffer.Count >= _batchSize || 
                 (JsqClock.Now - _lastFlushTime) >= _flushInterval)
             {
-                FlushInternal();
+                ScheduleFlushLocked();
             }
         }
     }
@@ -103,7 +130,7 @@ public class BatchWriter : IBatchWriter
         {
             foreach (var sample in batch.Samples)
             {
-                if (_buffer.Count >= _batchSize * 10)
+                if (_buffer.Count + _pendingSamples >= _batchSize * 10)
                 {
                     _stats.DroppedSamples++;
                     continue;
@@ -122,66 +149,158 @@ public class BatchWriter : IBatchWriter
             if (_buffer.Count >= _batchSize || 
                 (JsqClock.Now - _lastFlushTime) >= _flushInterval)
             {
-                FlushInternal();
+                ScheduleFlushLocked();
             }
         }
     }
     
     public async Task FlushAsync(CancellationToken ct = default)
     {
-        await Task.Run(() =>
+        ct.ThrowIfCancellationRequested();
+
+        Task flushTask;
+        lock (_lock)
         {
-            lock (_lock)
+            ScheduleFlushLocked();
+            flushTask = _flushTask;
+        }
+
+        // Отмена прекращает только ожидание: начатую запись воркер доводит до конца
+        if (ct.CanBeCanceled && !flushTask.IsCompleted)
+        {
+            var cancelled = new TaskCompletionSource<bool>();
+            using (ct.Register(() => cancelled.TrySetResult(true)))
             {
-                FlushInternal();
+                if (await Task.WhenAny(flushTask, cancelled.Task).ConfigureAwait(false) != flushTask)
+                    ct.ThrowIfCancellationRequested();
             }
-        }, ct);
+        }
+
+        await flushTask.ConfigureAwait(false);
     }
-    
-    private void FlushInternal()
+
+    /// <summary>
+    /// Передаёт накопленный буфер воркеру записи и запускает его, если он не работает.
+    /// Вызывается под _lock.
+    /// </summary>
+    private void ScheduleFlushLocked()
     {
-        if (_buffer.Count == 0)
+        if (_buffer.Count > 0)
+        {
+            _pending.Add(new PendingBatch(_buffer));
+            _pendingSamples += _buffer.Count;
+            _buffer = new List<SampleToWrite>(_batchSize);
+        }
+        _lastFlushTime = JsqClock.Now;
+
+        if (_flushRunning)
             return;
+
+        // Без новой работы FlushAsync не должен получать ошибку прошлого запуска воркера
+        _flushTask = _pending.Count > 0 ? Task.Run(DrainPending) : Task.CompletedTask;
+        _flushRunning = _pending.Count > 0;
+    }
+
+    /// <summary>
+    /// Воркер записи: пишет пакеты по очереди, пока они есть. При ошибке пакет
+    /// возвращается в начало очереди (порядок записи сохраняется), а задача воркера
+    /// завершается этой ошибкой; повтор — при следующем flush. Пакет, не записанный
+    /// MaxWriteAttempts раз подряд, отбрасывается, и воркер переходит к следующим.
+    /// </summary>
+    private void DrainPending()
+    {
+        Exception? dropError = null;
+        var droppedSamples = 0;
+
+        while (true)
+        {
+            PendingBatch batch;
+            lock (_lock)
+            {
+                if (_pending.Count == 0)
+                {
+                    _flushRunning = false;
+                    break;
+                }
+                batch = _pending[0];
+                _pending.RemoveAt(0);
+            }
+
+            try
+            {
+                WriteBatch(batch.Samples);
+            }
+            catch (Exception ex)
+            {
+                System.Diagnostics.Debug.WriteLine($"BatchWriter flush error: {ex.Message}");
+
+                lock (_lock)
+                {
+                    batch.FailedAttempts++;
+                    if (batch.FailedAttempts < MaxWriteAttempts)
+                    {
+                        _pending.Insert(0, batch);
+                        _flushRunning = false;
+                        throw;
+                    }
+
+                    _pendingSamples -= batch.Samples.Count;
+                    _stats.DroppedSamples += (ulong)batch.Samples.Count;
+                }
+
+                System.Diagnostics.Debug.WriteLine(
+                    $"BatchWriter: dropped {batch.Samples.Count} samples after {MaxWriteAttempts} failed writes");
+                dropError = ex;
+                droppedSamples += batch.Samples.Count;
+                continue;
+            }
+
+            lock (_lock)
+            {
+                _pendingSamples -= batch.Samples.Count;
+            }
+        }
+
+        if (dropError != null)
+        {
+            throw new InvalidOperationException(
+                $"Не удалось записать {droppedSamples} измерений, они отброшены", dropError);
+        }
+    }
+
+    private void WriteBatch(List<SampleToWrite> batch)
+    {
+        _writeTimer.Restart();
         
-        try
+        using var conn = _dbService.GetConnection();
+        using var transaction = conn.BeginTransaction();
+        
+        const string sql = @"
+            INSERT INTO raw_samples (experiment_id, timestamp, channel_index, value, is_valid)
+            VALUES (@ExperimentId, @Timestamp, @ChannelIndex, @Value, @IsValid);
+        ";
+        
+        conn.Execute(sql, batch, transaction);
+        transaction.Commit();
+        
+        _writeTimer.Stop();
+        
+        // Обновляем статистику
+        lock (_lock)
         {
-            _writeTimer.Restart();
-            
-            using var conn = _dbService.GetConnection();
-            using var transaction = conn.BeginTransaction();
-            
-            const string sql = @"
-                INSERT INTO raw_samples (experiment_id, timestamp, channel_index, value, is_valid)
-                VALUES (@ExperimentId, @Timestamp, @ChannelIndex, @Value, @IsValid);
-            ";
-            
-            conn.Execute(sql, _buffer, transaction);
-            transaction.Commit();
-            
-            _writeTimer.Stop();
-            
-            // Обновляем статистику
-            _stats.TotalSamplesWritten += (ulong)_buffer.Count;
+            _stats.TotalSamplesWritten += (ulong)batch.Count;
             _stats.TotalBatchesWritten++;
             _stats.LastWriteTime = JsqClock.Now;
-            
+
             // Скользящее среднее длительности записи
             var currentAvg = _stats.AvgWriteDuration.TotalMilliseconds;
             var newDuration = _writeTimer.Elapsed;
             _stats.AvgWriteDuration = TimeSpan.FromMilliseconds(
                 (currentAvg * 0.9) + (newDuration.TotalMilliseconds * 0.1)
             );
-            
-            _buffer.Clear();
-            _lastFlushTime = JsqClock.Now;
-        }
-        catch (Exception ex)
-        {
-            // Логгируем ошибку но не выбрасываем чтобы не прерывать поток
-            System.Diagnostics.Debug.WriteLine($"BatchWriter flush error: {ex.Message}");
         }
     }
-    
+
     public BatchWriterStatistics GetStatistics()
     {
         lock (_lock)
@@ -191,6 +310,7 @@ public class BatchWriter : IBatchWriter
                 TotalSamplesWritten = _stats.TotalSamplesWritten,
                 TotalBatchesWritten = _stats.TotalBatchesWritten,
                 DroppedSamples = _stats.DroppedSamples,
+                PendingSamples = _buffer.Count + _pendingSamples,
                 LastWriteTime = _stats.LastWriteTime,
                 AvgWriteDuration = _stats.AvgWriteDuration
             };
@@ -204,11 +324,35 @@ public class BatchWriter : IBatchWriter
         {
             FlushAsync(CancellationToken.None).Wait(TimeSpan.FromSeconds(5));
         }
-        catch { }
+        catch (Exception ex)
+        {
+            System.Diagnostics.Debug.WriteLine($"BatchWriter final flush error: {ex.GetBaseException().Message}");
+        }
+
+        lock (_lock)
+        {
+            var unwritten = _buffer.Count + _pendingSamples;
+            if (unwritten > 0)
+                System.Diagnostics.Debug.WriteLine($"BatchWriter: {unwritten} samples not written on dispose");
+        }
         
         GC.SuppressFinalize(this);
     }
     
+    /// <summary>
+    /// Пакет, ожидающий записи, и число неудачных попыток его записать
+    /// </summary>
+    private sealed class PendingBatch
+    {
+        public PendingBatch(List<SampleToWrite> samples)
+        {
+            Samples = samples;
+        }
+
+        public List<SampleToWrite> Samples { get; }
+        public int FailedAttempts { get; set; }
+    }
+
     private class SampleToWrite
     {
         public string ExperimentId { get; set; } = string.Empty;
@@ -68,9 +68,9 @@ public interface IExperimentRepository
         int channelIndex, DateTime startTime, DateTime endTime, CancellationToken ct = default);
 
     /// <summary>
-    /// Сохранить событие аномалии
+    /// Сохранить пачку событий аномалий одной транзакцией
     /// </summary>
-    Task SaveAnomalyEventAsync(AnomalyEvent evt, CancellationToken ct = default);
+    Task SaveAnomalyEventsAsync(IEnumerable<AnomalyEvent> events, CancellationToken ct = default);
 
     /// <summary>
     /// Сохранить агрегированные значения окон
@@ -448,15 +448,15 @@ public class ExperimentRepository : IExperimentRepository
             ORDER BY timestamp ASC;
         ";
 
-        var rows = (await conn.QueryAsync<SampleRow>(aggSql, new
+        var result = ParseSampleRows(await conn.QueryAsync<SampleRow>(aggSql, new
         {
             ExperimentId = experimentId,
             ChannelIndex = channelIndex,
             StartTime = startTime.ToString("O"),
             EndTime = endTime.ToString("O")
-        })).ToList();
+        }));
 
-        if (rows.Count == 0)
+        if (result.Count == 0)
         {
             const string rawSql = @"
                 SELECT timestamp AS Timestamp, value AS Value
@@ -469,16 +469,16 @@ public class ExperimentRepository : IExperimentRepository
                 ORDER BY timestamp ASC;
             ";
 
-            rows = (await conn.QueryAsync<SampleRow>(rawSql, new
+            result = ParseSampleRows(await conn.QueryAsync<SampleRow>(rawSql, new
             {
                 ExperimentId = experimentId,
                 ChannelIndex = channelIndex,
                 StartTime = startTime.ToString("O"),
                 EndTime = endTime.ToString("O")
-            })).ToList();
+            }));
         }
 
-        return ParseSampleRows(rows);
+        return result;
     }
 
     public async Task<List<(DateTime time, double value)>> GetChannelHistoryAnyAsync(
@@ -496,14 +496,14 @@ public class ExperimentRepository : IExperimentRepository
             ORDER BY timestamp ASC;
         ";
 
-        var rows = (await conn.QueryAsync<SampleRow>(aggSql, new
+        var result = ParseSampleRows(await conn.QueryAsync<SampleRow>(aggSql, new
         {
             ChannelIndex = channelIndex,
             StartTime = startTime.ToString("O"),
             EndTime = endTime.ToString("O")
-        })).ToList();
+        }));
 
-        if (rows.Count == 0)
+        if (result.Count == 0)
         {
             const string rawSql = @"
                 SELECT timestamp AS Timestamp, value AS Value
@@ -515,15 +515,15 @@ public class ExperimentRepository : IExperimentRepository
                 ORDER BY timestamp ASC;
             ";
 
-            rows = (await conn.QueryAsync<SampleRow>(rawSql, new
+            result = ParseSampleRows(await conn.QueryAsync<SampleRow>(rawSql, new
             {
                 ChannelIndex = channelIndex,
                 StartTime = startTime.ToString("O"),
                 EndTime = endTime.ToString("O")
-            })).ToList();
+            }));
         }
 
-        return ParseSampleRows(rows);
+        return result;
     }
 
     public async Task SaveAggregatesAsync(
@@ -567,13 +567,17 @@ public class ExperimentRepository : IExperimentRepository
         transaction.Commit();
     }
 
+    /// <summary>
+    /// Разбирает строки выборки за один проход, без промежуточной копии результата Dapper.
+    /// </summary>
     private static List<(DateTime time, double value)> ParseSampleRows(IEnumerable<SampleRow> rows)
     {
-        var result = new List<(DateTime, double)>();
+        var result = rows is ICollection<SampleRow> collection
+            ? new List<(DateTime, double)>(collection.Count)
+            : new List<(DateTime, double)>();
         foreach (var r in rows)
         {
-            if (DateTime.TryParse(r.Timestamp, null,
-                    System.Globalization.DateTimeStyles.RoundtripKind, out var ts))
+            if (JsqClock.TryParseStored(r.Timestamp, out var ts))
                 result.Add((ts, r.Value));
         }
         return result;
@@ -585,9 +589,15 @@ public class ExperimentRepository : IExperimentRepository
         public double Value { get; set; }
     }
 
-    public async Task SaveAnomalyEventAsync(AnomalyEvent evt, CancellationToken ct = default)
+    public async Task SaveAnomalyEventsAsync(IEnumerable<AnomalyEvent> events, CancellationToken ct = default)
     {
+        var rows = events?.ToList() ?? new List<AnomalyEvent>();
+        if (rows.Count == 0)
+            return;
+
         using var conn = _dbService.GetConnection();
+        using var transaction = conn.BeginTransaction();
+
         const string sql = @"
             INSERT INTO anomaly_events (
                 experiment_id, timestamp, channel_index, channel_name,
@@ -597,7 +607,7 @@ public class ExperimentRepository : IExperimentRepository
                 @AnomalyType, @Value, @Threshold
             );
         ";
-        await conn.ExecuteAsync(sql, new
+        await conn.ExecuteAsync(sql, rows.Select(evt => new
         {
             ExperimentId = evt.ExperimentId,
             Timestamp = evt.Timestamp.ToString("O"),
@@ -606,7 +616,9 @@ public class ExperimentRepository : IExperimentRepository
             AnomalyType = evt.AnomalyType.ToString(),
             Value = evt.Value,
             Threshold = evt.Threshold
-        });
+        }), transaction);
+
+        transaction.Commit();
     }
 
     public async Task<List<AnomalyEventRecord>> GetAnomalyEventsAsync(
@@ -691,18 +703,20 @@ public class ExperimentRepository : IExperimentRepository
     public async Task<(DateTime? start, DateTime? end)> GetExperimentDataRangeAsync(string experimentId, CancellationToken ct = default)
     {
         using var conn = _dbService.GetConnection();
+        // Границы берутся отдельно по каждой таблице: MIN/MAX по индексу (experiment_id, timestamp)
+        // сводится к одному поиску в индексе вместо перебора всех строк эксперимента.
         const string sql = @"
             SELECT
                 MIN(ts) AS StartTimestamp,
                 MAX(ts) AS EndTimestamp
             FROM (
-                SELECT timestamp AS ts
-                FROM agg_samples_20s
-                WHERE experiment_id = @ExperimentId
+                SELECT MIN(timestamp) AS ts FROM agg_samples_20s WHERE experiment_id = @ExperimentId
                 UNION ALL
-                SELECT timestamp AS ts
-                FROM raw_samples
-                WHERE experiment_id = @ExperimentId
+                SELECT MAX(timestamp) AS ts FROM agg_samples_20s WHERE experiment_id = @ExperimentId
+                UNION ALL
+                SELECT MIN(timestamp) AS ts FROM raw_samples WHERE experiment_id = @ExperimentId
+                UNION ALL
+                SELECT MAX(timestamp) AS ts FROM raw_samples WHERE experiment_id = @ExperimentId
             );
         ";
 
@@ -716,13 +730,13 @@ public class ExperimentRepository : IExperimentRepository
         DateTime? end = null;
 
         if (!string.IsNullOrWhiteSpace(row.StartTimestamp) &&
-            DateTime.TryParse(row.StartTimestamp, null, System.Globalization.DateTimeStyles.RoundtripKind, out var s))
+            JsqClock.TryParseStored(row.StartTimestamp, out var s))
         {
             start = s;
         }
 
         if (!string.IsNullOrWhiteSpace(row.EndTimestamp) &&
-            DateTime.TryParse(row.EndTimestamp, null, System.Globalization.DateTimeStyles.RoundtripKind, out var e))
+            JsqClock.TryParseStored(row.EndTimestamp, out var e))
         {
             end = e;
         }
@@ -1003,7 +1017,7 @@ public static class ExperimentEntityExtensions
         if (string.IsNullOrWhiteSpace(text))
             return null;
 
-        if (DateTime.TryParse(text, null, System.Globalization.DateTimeStyles.RoundtripKind, out var dt))
+        if (JsqClock.TryParseStored(text, out var dt))
             return dt;
 
         if (DateTime.TryParse(text, out dt))
@@ -0,0 +1,88 @@
+using System;
+using System.Linq;
+using JSQ.Core.Models;
+using JSQ.Rules;
+using Xunit;
+
+namespace JSQ.Tests;
+
+public class AggregationServiceTests
+{
+    [Fact]
+    public void Flush_SingleWindow_ReturnsMinMaxFirstLastAndCounts()
+    {
+        var service = new AggregationService(intervalSeconds: 20);
+        var t0 = new DateTime(2025, 10, 30, 14, 56, 40);
+
+        service.AddSample(new Sample(7, 5.0, t0));
+        service.AddSample(new Sample(7, 2.0, t0.AddSeconds(1)));
+        service.AddSample(new Sample(7, -99, t0.AddSeconds(2))); // невалидное — только в InvalidCount
+        service.AddSample(new Sample(7, 9.0, t0.AddSeconds(3)));
+        service.AddSample(new Sample(7, 4.0, t0.AddSeconds(4)));
+
+        var aggregate = Assert.Single(service.Flush());
+
+        Assert.Equal(7, aggregate.ChannelIndex);
+        Assert.Equal(t0, aggregate.WindowStart);
+        Assert.Equal(2.0, aggregate.Min);
+        Assert.Equal(9.0, aggregate.Max);
+        Assert.Equal(5.0, aggregate.First);
+        Assert.Equal(4.0, aggregate.Last);
+        Assert.Equal(5.0, aggregate.Avg);
+        Assert.Equal(4, aggregate.SampleCount);
+        Assert.Equal(1, aggregate.InvalidCount);
+        Assert.Equal(5, aggregate.TotalCount);
+        Assert.Equal(0, aggregate.QualityFlag); // 20% невалидных — degraded
+    }
+
+    [Fact]
+    public void AddSamples_Frame_MatchesPerSampleAggregation()
+    {
+        var t0 = new DateTime(2025, 10, 30, 14, 56, 40);
+        var frames = Enumerable.Range(0, 25)
+            .Select(s => new[]
+            {
+                new Sample(1, 10.0 + s, t0.AddSeconds(s)),
+                new Sample(2, s % 3 == 0 ? -99 : s * 0.5, t0.AddSeconds(s)),
+                new Sample(5, -s, t0.AddSeconds(s))
+            })
+            .ToList();
+
+        var single = new AggregationService(intervalSeconds: 20, highPrecisionChannels: new[] { 5 });
+        var batched = new AggregationService(intervalSeconds: 20, highPrecisionChannels: new[] { 5 });
+        foreach (var frame in frames)
+        {
+            foreach (var sample in frame)
+                single.AddSample(sample);
+            batched.AddSamples(frame);
+        }
+
+        var expected = single.Flush().OrderBy(a => a.ChannelIndex).ThenBy(a => a.WindowStart).ToList();
+        var actual = batched.Flush().OrderBy(a => a.ChannelIndex).ThenBy(a => a.WindowStart).ToList();
+
+        Assert.Equal(expected.Count, actual.Count);
+        for (var i = 0; i < expected.Count; i++)
+        {
+            Assert.Equal(expected[i].ChannelIndex, actual[i].ChannelIndex);
+            Assert.Equal(expected[i].WindowStart, actual[i].WindowStart);
+            Assert.Equal(expected[i].WindowSeconds, actual[i].WindowSeconds);
+            Assert.Equal(expected[i].Avg, actual[i].Avg);
+            Assert.Equal(expected[i].Min, actual[i].Min);
+            Assert.Equal(expected[i].Max, actual[i].Max);
+            Assert.Equal(expected[i].TotalCount, actual[i].TotalCount);
+        }
+        Assert.Equal(75, batched.GetStatistics().TotalSamplesProcessed);
+    }
+
+    [Fact]
+    public void Flush_OnlyInvalidSamples_ReturnsNoAggregate()
+    {
+        var service = new AggregationService(intervalSeconds: 20);
+        var t0 = new DateTime(2025, 10, 30, 14, 56, 40);
+
+        service.AddSample(new Sample(3, -99, t0));
+        service.AddSample(new Sample(3, -99, t0.AddSeconds(1)));
+
+        Assert.Empty(service.Flush().ToList());
+    }
+}
@@ -0,0 +1,184 @@
+using System;
+using System.Data;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+using Dapper;
+using JSQ.Core.Models;
+using JSQ.Storage;
+using Microsoft.Data.Sqlite;
+using Xunit;
+
+namespace JSQ.Tests;
+
+public class BatchWriterTests
+{
+    private static readonly DateTime T0 = new(2025, 10, 30, 14, 56, 40);
+
+    [Fact]
+    public async Task FlushAsync_WritesSwappedBatchesAndBufferInOrder()
+    {
+        using var db = new InMemoryDatabaseService();
+        using var writer = new BatchWriter(db, batchSize: 2, flushIntervalSec: 3600);
+
+        // Воркер ждёт на первом пакете — остальные копятся в очереди и в буфере
+        db.Gate.Reset();
+        for (var i = 0; i < 8; i++)
+            writer.AddSamples("exp", new[] { new Sample(1, i, T0.AddSeconds(i)) });
+
+        Assert.Equal(8, writer.GetStatistics().PendingSamples);
+
+        var flush = writer.FlushAsync();
+        db.Gate.Set();
+        await flush;
+
+        Assert.Equal(Enumerable.Range(0, 8).Select(i => (double)i), db.ReadValues());
+        var stats = writer.GetStatistics();
+        Assert.Equal(0, stats.PendingSamples);
+        Assert.Equal(8UL, stats.TotalSamplesWritten);
+    }
+
+    [Fact]
+    public async Task FlushAsync_AfterFailedWrite_FaultsAndRetriesOnNextFlush()
+    {
+        using var db = new InMemoryDatabaseService();
+        using var writer = new BatchWriter(db, batchSize: 500, flushIntervalSec: 3600);
+
+        db.Gate.Reset();
+        db.FailNextWrites(1);
+        writer.AddSamples("exp", new[]
+        {
+            new Sample(1, 1.0, T0),
+            new Sample(2, 2.0, T0),
+            new Sample(3, 3.0, T0)
+        });
+
+        var failed = writer.FlushAsync();
+        db.Gate.Set();
+        await Assert.ThrowsAsync<InvalidOperationException>(() => failed);
+
+        Assert.Empty(db.ReadValues());
+        Assert.Equal(3, writer.GetStatistics().PendingSamples);
+
+        await writer.FlushAsync();
+
+        Assert.Equal(new[] { 1.0, 2.0, 3.0 }, db.ReadValues());
+        Assert.Equal(0, writer.GetStatistics().PendingSamples);
+        Assert.Equal(0UL, writer.GetStatistics().DroppedSamples);
+    }
+
+    [Fact]
+    public async Task FlushAsync_BatchThatKeepsFailing_IsDroppedAndDoesNotBlockQueue()
+    {
+        using var db = new InMemoryDatabaseService();
+        using var writer = new BatchWriter(db, batchSize: 500, flushIntervalSec: 3600);
+
+        db.FailNextWrites(int.MaxValue);
+        writer.AddSamples("exp", new[] { new Sample(1, 1.0, T0), new Sample(2, 2.0, T0) });
+
+        for (var attempt = 0; attempt < 10 && writer.GetStatistics().PendingSamples > 0; attempt++)
+        {
+            try { await writer.FlushAsync(); }
+            catch (InvalidOperationException) { }
+        }
+
+        Assert.Equal(0, writer.GetStatistics().PendingSamples);
+        Assert.Equal(2UL, writer.GetStatistics().DroppedSamples);
+
+        db.FailNextWrites(0);
+        writer.AddSamples("exp", new[] { new Sample(1, 5.0, T0.AddSeconds(1)) });
+        await writer.FlushAsync();
+
+        Assert.Equal(new[] { 5.0 }, db.ReadValues());
+    }
+
+    [Fact]
+    public async Task FlushAsync_CancelledWhileWriting_StopsWaiting()
+    {
+        using var db = new InMemoryDatabaseService();
+        using var writer = new BatchWriter(db, batchSize: 500, flushIntervalSec: 3600);
+
+        db.Gate.Reset();
+        writer.AddSamples("exp", new[] { new Sample(1, 1.0, T0) });
+
+        using var cts = new CancellationTokenSource();
+        var flush = writer.FlushAsync(cts.Token);
+        cts.Cancel();
+        await Assert.ThrowsAnyAsync<OperationCanceledException>(() => flush);
+
+        db.Gate.Set();
+        await writer.FlushAsync();
+        Assert.Equal(new[] { 1.0 }, db.ReadValues());
+    }
+
+    /// <summary>
+    /// БД в памяти (shared cache) с управляемыми задержкой и отказами записи
+    /// </summary>
+    private sealed class InMemoryDatabaseService : IDatabaseService
+    {
+        private readonly string _connectionString =
+            $"Data Source=batchwriter-{Guid.NewGuid():N};Mode=Memory;Cache=Shared";
+        // БД в памяти живёт, пока открыто хотя бы одно подключение
+        private readonly SqliteConnection _keepAlive;
+        private int _failures;
+
+        public InMemoryDatabaseService()
+        {
+            _keepAlive = new SqliteConnection(_connectionString);
+            _keepAlive.Open();
+            _keepAlive.Execute(@"
+                CREATE TABLE raw_samples (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    experiment_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    channel_index INTEGER NOT NULL,
+                    value REAL NOT NULL,
+                    is_valid INTEGER DEFAULT 1
+                );");
+        }
+
+        /// <summary>
+        /// Пока сброшен, воркер записи ждёт на получении подключения
+        /// </summary>
+        public ManualResetEventSlim Gate { get; } = new(true);
+
+        public string DbPath => string.Empty;
+
+        public void FailNextWrites(int count) => Volatile.Write(ref _failures, count);
+
+        public double[] ReadValues() =>
+            _keepAlive.Query<double>("SELECT value FROM raw_samples ORDER BY id").ToArray();
+
+        public IDbConnection GetConnection()
+        {
+            Gate.Wait();
+
+            int failures;
+            do
+            {
+                failures = Volatile.Read(ref _failures);
+                if (failures <= 0)
+                    break;
+            }
+            while (Interlocked.CompareExchange(ref _failures, failures - 1, failures) != failures);
+
+            if (failures > 0)
+                throw new InvalidOperationException("БД недоступна");
+
+            var conn = new SqliteConnection(_connectionString);
+            conn.Open();
+            return conn;
+        }
+
+        public Task InitializeAsync(CancellationToken ct = default) => Task.CompletedTask;
+        public Task CheckpointAsync(CancellationToken ct = default) => Task.CompletedTask;
+        public long GetDatabaseSize() => 0;
+
+        public void Dispose()
+        {
+            Gate.Set();
+            _keepAlive.Dispose();
+            Gate.Dispose();
+        }
+    }
+}
@@ -0,0 +1,42 @@
+using System;
+using JSQ.Core.Models;
+using Xunit;
+
+namespace JSQ.Tests;
+
+/// <summary>
+/// Тесты разбора времени, сохранённого в БД
+/// </summary>
+public class JsqClockTests
+{
+    [Fact]
+    public void TryParseStored_RoundtripFormat_KeepsValueAndKind()
+    {
+        // Arrange
+        var local = new DateTime(2025, 10, 30, 14, 56, 52, 423, DateTimeKind.Local);
+        var utc = new DateTime(2025, 10, 30, 9, 56, 52, 423, DateTimeKind.Utc);
+
+        // Act & Assert
+        Assert.True(JsqClock.TryParseStored(local.ToString("O"), out var parsedLocal));
+        Assert.Equal(local, parsedLocal);
+        Assert.Equal(DateTimeKind.Local, parsedLocal.Kind);
+
+        Assert.True(JsqClock.TryParseStored(utc.ToString("O"), out var parsedUtc));
+        Assert.Equal(utc, parsedUtc);
+        Assert.Equal(DateTimeKind.Utc, parsedUtc.Kind);
+    }
+
+    [Fact]
+    public void TryParseStored_NowIsoAndFreeFormat_AreParsed()
+    {
+        // Act & Assert
+        Assert.True(JsqClock.TryParseStored("2025-10-30 14:56:52.4230000", out var iso));
+        Assert.Equal(new DateTime(2025, 10, 30, 14, 56, 52, 423), iso);
+
+        Assert.True(JsqClock.TryParseStored("2025-10-30T14:56:52", out var fallback));
+        Assert.Equal(new DateTime(2025, 10, 30, 14, 56, 52), fallback);
+
+        Assert.False(JsqClock.TryParseStored("не дата", out _));
+        Assert.False(JsqClock.TryParseStored(null, out _));
+    }
+}
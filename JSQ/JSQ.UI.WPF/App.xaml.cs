@@ -6,6 +6,7 @@ using System.Windows;
 using Microsoft.Extensions.DependencyInjection;
 using JSQ.UI.WPF.ViewModels;
 using JSQ.Core.Models;
+using JSQ.Decode;
 using JSQ.Export;
 using JSQ.Storage;
 using JSQ.UI.WPF.Services.AutoUpdate;
@@ -109,7 +110,7 @@ public class ExperimentServiceStub : IExperimentService
 {
     public event Action<SystemHealth> HealthUpdated = delegate { };
     public event Action<LogEntry> LogReceived = delegate { };
-    public event Action<int, double>? ChannelValueReceived
+    public event Action<IReadOnlyList<ChannelValue>>? ChannelValuesReceived
     {
         add { }
         remove { }
@@ -1,4 +1,5 @@
 using System;
+using System.Collections.Generic;
 using System.Globalization;
 using System.Windows.Data;
 using System.Windows.Media;
@@ -30,6 +31,12 @@ public sealed class RowBackgroundConverter : IMultiValueConverter
     private static readonly SolidColorBrush ZebraBrush     = Freeze(0xF5, 0xF5, 0xF5); // #F5F5F5
     private static readonly SolidColorBrush DefaultBrush   = Brushes.White;
 
+    // Кисти пометок по hex-строке: палитра пометок небольшая, а конвертер вызывается
+    // на каждое изменение статуса строки. Нераспознанные строки кэшируются как null,
+    // чтобы не ловить исключение парсера повторно. Конвертер работает только в UI-потоке.
+    private static readonly Dictionary<string, SolidColorBrush?> HighlightBrushes =
+        new(StringComparer.OrdinalIgnoreCase);
+
     public object Convert(object[] values, Type targetType, object parameter, CultureInfo culture)
     {
         var highlightColor   = values.Length > 0 ? values[0] as string           : null;
@@ -44,12 +51,9 @@ public sealed class RowBackgroundConverter : IMultiValueConverter
         // 2. Пользовательский цвет пометки
         if (!string.IsNullOrEmpty(highlightColor))
         {
-            try
-            {
-                var color = (Color)ColorConverter.ConvertFromString(highlightColor);
-                return new SolidColorBrush(color);
-            }
-            catch { }
+            var highlightBrush = GetHighlightBrush(highlightColor!);
+            if (highlightBrush != null)
+                return highlightBrush;
         }
 
         // 3. Идёт запись (OK + IsRecording)
@@ -66,6 +70,24 @@ public sealed class RowBackgroundConverter : IMultiValueConverter
     public object[] ConvertBack(object value, Type[] targetTypes, object parameter, CultureInfo culture)
         => throw new NotSupportedException();
 
+    private static SolidColorBrush? GetHighlightBrush(string highlightColor)
+    {
+        if (HighlightBrushes.TryGetValue(highlightColor, out var cached))
+            return cached;
+
+        SolidColorBrush? brush = null;
+        try
+        {
+            var color = (Color)ColorConverter.ConvertFromString(highlightColor);
+            brush = new SolidColorBrush(color);
+            brush.Freeze();
+        }
+        catch { }
+
+        HighlightBrushes[highlightColor] = brush;
+        return brush;
+    }
+
     private static SolidColorBrush Freeze(byte r, byte g, byte b)
     {
         var brush = new SolidColorBrush(Color.FromRgb(r, g, b));
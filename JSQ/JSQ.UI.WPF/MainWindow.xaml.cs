@@ -22,6 +22,7 @@ namespace JSQ.UI.WPF;
 public partial class MainWindow : Window
 {
     private readonly string _layoutPath = Path.Combine(AppDomain.CurrentDomain.BaseDirectory, "main_grid_layout.json");
+    private static readonly JsonSerializerOptions IndentedJsonOptions = new() { WriteIndented = true };
     private Point _dragStartPoint;
     private bool _isLogsVisible = true;
     private GridLength _savedLogsHeight = new(180);
@@ -580,7 +581,7 @@ public partial class MainWindow : Window
                 PostC = CaptureGridLayout(PostCDataGrid)
             };
 
-            var json = JsonSerializer.Serialize(file, new JsonSerializerOptions { WriteIndented = true });
+            var json = JsonSerializer.Serialize(file, IndentedJsonOptions);
             File.WriteAllText(_layoutPath, json);
         }
         catch
@@ -12,6 +12,9 @@ namespace JSQ.UI.WPF.Services.AutoUpdate;
 
 public sealed class AutoUpdateManager : IDisposable
 {
+    private static readonly JsonSerializerOptions IndentedJsonOptions = new() { WriteIndented = true };
+    // Версия запущенной сборки постоянна — разбираем атрибуты один раз, а не на каждой проверке
+    private static readonly Version CurrentVersion = ResolveCurrentVersion();
     private readonly SettingsViewModel _settings;
     private readonly Func<bool> _isRecordingActive;
     private readonly string _stateFilePath;
@@ -85,8 +88,7 @@ public sealed class AutoUpdateManager : IDisposable
                 return;
             }
 
-            var currentVersion = ResolveCurrentVersion();
-            if (remoteVersion <= currentVersion)
+            if (remoteVersion <= CurrentVersion)
             {
                 ClearPendingState();
                 EmitStatus(null);
@@ -94,7 +96,8 @@ public sealed class AutoUpdateManager : IDisposable
             }
 
             var sourcePackage = Path.Combine(feedPath, manifest.PackageFile);
-            if (!File.Exists(sourcePackage))
+            var sourceInfo = new FileInfo(sourcePackage);
+            if (!sourceInfo.Exists)
             {
                 EmitStatus(null);
                 return;
@@ -106,13 +109,15 @@ public sealed class AutoUpdateManager : IDisposable
 
             // Пересчитываем хэш кэшированного файла чтобы обнаружить битые копии
             // (прерванная загрузка с сети даёт файл верного размера, но неверного хэша).
-            var needsCopy = !File.Exists(cachedPackage)
-                || new FileInfo(cachedPackage).Length != new FileInfo(sourcePackage).Length
-                || !ValidateHash(cachedPackage, manifest.Sha256);
-            if (needsCopy)
+            // Метаданные файлов читаются один раз; если кэш прошёл проверку, повторно хэш не считаем.
+            var cachedInfo = new FileInfo(cachedPackage);
+            var cacheValid = cachedInfo.Exists
+                && cachedInfo.Length == sourceInfo.Length
+                && ValidateHash(cachedPackage, manifest.Sha256);
+            if (!cacheValid)
                 File.Copy(sourcePackage, cachedPackage, overwrite: true);
 
-            if (!ValidateHash(cachedPackage, manifest.Sha256))
+            if (!cacheValid && !ValidateHash(cachedPackage, manifest.Sha256))
             {
                 StatusChanged?.Invoke(new AutoUpdateStatus
                 {
@@ -175,7 +180,7 @@ public sealed class AutoUpdateManager : IDisposable
     {
         var dir = Path.GetDirectoryName(_stateFilePath)!;
         Directory.CreateDirectory(dir);
-        var json = JsonSerializer.Serialize(state, new JsonSerializerOptions { WriteIndented = true });
+        var json = JsonSerializer.Serialize(state, IndentedJsonOptions);
         File.WriteAllText(_stateFilePath, json);
     }
 
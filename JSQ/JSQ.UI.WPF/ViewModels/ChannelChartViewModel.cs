@@ -1,10 +1,11 @@
 using System;
 using System.Collections.Generic;
-using System.Linq;
+using System.Threading;
 using System.Threading.Tasks;
 using System.Windows.Threading;
 using CommunityToolkit.Mvvm.ComponentModel;
 using JSQ.Core.Models;
+using JSQ.Decode;
 using OxyPlot;
 using OxyPlot.Annotations;
 using OxyPlot.Axes;
@@ -17,13 +18,40 @@ namespace JSQ.UI.WPF.ViewModels;
 /// </summary>
 public partial class ChannelChartViewModel : ObservableObject
 {
+    // Больше точек, чем пикселей по ширине графика, не даёт визуальной разницы
+    private const int MaxPlotPoints = 4000;
+
+    // Буфер ограничен — 100 000 точек (~24 часа при 1 Гц); старые точки вытесняются по одной
+    private const int MaxRawPoints = 100000;
+
+    // Без новых точек график перерисовывается реже — только чтобы сдвигать окно по времени
+    private static readonly TimeSpan IdleRefreshInterval = TimeSpan.FromSeconds(2);
+
     private readonly IExperimentService _service;
-    private readonly List<(DateTime time, double value)> _rawPoints = new(100000);
+    // Кольцевой буфер точек: _rawCount точек начиная с _rawStart (по модулю MaxRawPoints)
+    private readonly (DateTime time, double value)[] _rawPoints = new (DateTime, double)[MaxRawPoints];
+    private int _rawStart;
+    private int _rawCount;
     private readonly object _pointsLock = new();
+    // Рабочий массив отрисовки живёт между тиками: в него под _pointsLock копируются
+    // только нужные точки (новые или попавшие в окно), а не весь буфер
+    private (DateTime time, double value)[] _scratch = new (DateTime, double)[256];
     private readonly DispatcherTimer _refreshTimer;
     private readonly LineSeries _series;
+    private readonly DateTimeAxis _xAxis;
+    private readonly LinearAxis _yAxis;
+    // Постоянная часть подписи текущего значения — единица измерения
+    private readonly string _valueSuffix;
     private DateTime _experimentStartTime;
     private bool _historyLoaded;
+    private int _hasNewPoints;
+    private DateTime _lastRefreshTime = DateTime.MinValue;
+    // Счётчик всех точек, попавших в буфер (под _pointsLock), и его значение на момент
+    // последней отрисовки — разница показывает, сколько точек в хвосте ещё не на графике
+    private long _pointsAdded;
+    private long _plottedThrough;
+    // Серия содержит ровно точки окна без прореживания — её можно дополнять, а не перестраивать
+    private bool _seriesIncremental;
 
     public int ChannelIndex { get; }
     public string ChannelName { get; }
@@ -46,6 +74,7 @@ public partial class ChannelChartViewModel : ObservableObject
         ChannelIndex = channel.ChannelIndex;
         ChannelName = channel.ChannelName;
         Unit = channel.Unit ?? string.Empty;
+        _valueSuffix = " " + Unit;
         _service = service;
         // Если запись идёт — запоминаем старт; иначе показываем последние 5 минут
         _experimentStartTime = experimentStart ?? JsqClock.Now.AddMinutes(-5);
@@ -58,6 +87,24 @@ public partial class ChannelChartViewModel : ObservableObject
             maxLimit = def.MaxLimit;
         }
 
+        _xAxis = new DateTimeAxis
+        {
+            Position = AxisPosition.Bottom,
+            StringFormat = "HH:mm:ss",
+            MajorGridlineStyle = LineStyle.Solid,
+            MinorGridlineStyle = LineStyle.Dot,
+            MajorGridlineColor = OxyColor.FromRgb(220, 220, 220)
+        };
+
+        _yAxis = new LinearAxis
+        {
+            Position = AxisPosition.Left,
+            Title = Unit,
+            MajorGridlineStyle = LineStyle.Solid,
+            MinorGridlineStyle = LineStyle.Dot,
+            MajorGridlineColor = OxyColor.FromRgb(220, 220, 220)
+        };
+
         PlotModel = BuildPlotModel(minLimit, maxLimit);
 
         _series = new LineSeries
@@ -69,10 +116,10 @@ public partial class ChannelChartViewModel : ObservableObject
         };
         PlotModel.Series.Add(_series);
 
-        _service.ChannelValueReceived += OnChannelValue;
+        _service.ChannelValuesReceived += OnChannelValues;
 
         _refreshTimer = new DispatcherTimer { Interval = TimeSpan.FromMilliseconds(500) };
-        _refreshTimer.Tick += async (_, _) => await RefreshChartAsync();
+        _refreshTimer.Tick += async (_, _) => await OnRefreshTickAsync();
         _refreshTimer.Start();
         
         // Загружаем историю при открытии
@@ -83,23 +130,8 @@ public partial class ChannelChartViewModel : ObservableObject
     {
         var model = new PlotModel { Title = ChannelName, TitleFontSize = 13 };
 
-        model.Axes.Add(new DateTimeAxis
-        {
-            Position = AxisPosition.Bottom,
-            StringFormat = "HH:mm:ss",
-            MajorGridlineStyle = LineStyle.Solid,
-            MinorGridlineStyle = LineStyle.Dot,
-            MajorGridlineColor = OxyColor.FromRgb(220, 220, 220)
-        });
-
-        model.Axes.Add(new LinearAxis
-        {
-            Position = AxisPosition.Left,
-            Title = Unit,
-            MajorGridlineStyle = LineStyle.Solid,
-            MinorGridlineStyle = LineStyle.Dot,
-            MajorGridlineColor = OxyColor.FromRgb(220, 220, 220)
-        });
+        model.Axes.Add(_xAxis);
+        model.Axes.Add(_yAxis);
 
         if (minLimit.HasValue)
         {
@@ -128,7 +160,7 @@ public partial class ChannelChartViewModel : ObservableObject
         return model;
     }
 
-    partial void OnSelectedWindowChanged(string value) => _ = RefreshChartAsync();
+    partial void OnSelectedWindowChanged(string value) => _ = RefreshChartAsync(rebuild: true);
     
     /// <summary>
     /// Загрузить исторические данные из БД
@@ -149,12 +181,14 @@ public partial class ChannelChartViewModel : ObservableObject
         
         lock (_pointsLock)
         {
-            _rawPoints.Clear();
-            _rawPoints.AddRange(history);
+            _rawStart = 0;
+            _rawCount = 0;
+            foreach (var point in history)
+                AddRawPoint(point);
             _historyLoaded = true;
         }
         
-        await RefreshChartAsync();
+        await RefreshChartAsync(rebuild: true);
     }
     
     /// <summary>
@@ -167,63 +201,220 @@ public partial class ChannelChartViewModel : ObservableObject
         _ = LoadHistoryAsync();
     }
 
-    private void OnChannelValue(int index, double value)
+    private void OnChannelValues(IReadOnlyList<ChannelValue> values)
     {
-        if (index != ChannelIndex || double.IsNaN(value)) return;
+        foreach (var cv in values)
+        {
+            if (cv.Index != ChannelIndex) continue;
+            if (double.IsNaN(cv.Value)) return;
 
-        lock (_pointsLock)
+            lock (_pointsLock)
+            {
+                AddRawPoint((JsqClock.Now, cv.Value));
+            }
+            Interlocked.Exchange(ref _hasNewPoints, 1);
+            return;
+        }
+    }
+
+    /// <summary>
+    /// Добавляет точку в буфер, вытесняя самую старую при заполнении. Вызывается под _pointsLock.
+    /// </summary>
+    private void AddRawPoint((DateTime time, double value) point)
+    {
+        if (_rawCount == MaxRawPoints)
+        {
+            _rawPoints[_rawStart] = point;
+            _rawStart = (_rawStart + 1) % MaxRawPoints;
+        }
+        else
         {
-            _rawPoints.Add((JsqClock.Now, value));
-            // Ограничиваем буфер — 100 000 точек (~24 часа при 1 Гц)
-            if (_rawPoints.Count > 100000)
-                _rawPoints.RemoveRange(0, 10000);
+            _rawPoints[(_rawStart + _rawCount) % MaxRawPoints] = point;
+            _rawCount++;
         }
+        _pointsAdded++;
     }
 
-    private async Task RefreshChartAsync()
+    private (DateTime time, double value) RawPointAt(int index) =>
+        _rawPoints[(_rawStart + index) % MaxRawPoints];
+
+    /// <summary>
+    /// Копирует в _scratch последние count точек буфера. Вызывается под _pointsLock.
+    /// </summary>
+    private int CopyLatestRawPoints(int count)
     {
-        (DateTime time, double value)[] snapshot;
-        lock (_pointsLock)
+        EnsureScratchCapacity(count);
+        var from = _rawCount - count;
+        for (var i = 0; i < count; i++)
+            _scratch[i] = RawPointAt(from + i);
+        return count;
+    }
+
+    /// <summary>
+    /// Копирует в _scratch точки не старше cutoff. Вызывается под _pointsLock.
+    /// </summary>
+    private int CopyRawPointsSince(DateTime cutoff)
+    {
+        var count = 0;
+        for (var i = 0; i < _rawCount; i++)
         {
-            if (_rawPoints.Count == 0) return;
-            snapshot = _rawPoints.ToArray();
+            var point = RawPointAt(i);
+            if (point.time < cutoff) continue;
+            EnsureScratchCapacity(count + 1);
+            _scratch[count++] = point;
         }
+        return count;
+    }
+
+    private void EnsureScratchCapacity(int count)
+    {
+        if (_scratch.Length < count)
+            Array.Resize(ref _scratch, Math.Max(count, _scratch.Length * 2));
+    }
+
+    /// <summary>
+    /// Тик таймера: перерисовка только при новых точках или по истечении интервала простоя.
+    /// Смена окна и загрузка истории вызывают RefreshChartAsync напрямую.
+    /// </summary>
+    private async Task OnRefreshTickAsync()
+    {
+        var hasNewPoints = Interlocked.Exchange(ref _hasNewPoints, 0) == 1;
+        if (!hasNewPoints && JsqClock.Now - _lastRefreshTime < IdleRefreshInterval)
+            return;
+
+        await RefreshChartAsync();
+    }
+
+    private async Task RefreshChartAsync(bool rebuild = false)
+    {
+        _lastRefreshTime = JsqClock.Now;
 
         var span = GetWindowSpan();
         var now = JsqClock.Now;
         var cutoff = span.HasValue ? now - span.Value : _experimentStartTime;
 
-        var filtered = snapshot.Where(p => p.time >= cutoff).ToArray();
+        // Обычный тик меняет только края окна: слева уходят устаревшие точки, справа
+        // добавляются новые. Серия целиком перестраивается лишь при смене окна, загрузке
+        // истории или когда точек становится больше, чем рисуется без прореживания.
+        (DateTime time, double value) last;
+        long pointsAdded;
+        int count;
+        var incremental = !rebuild && _seriesIncremental;
+        lock (_pointsLock)
+        {
+            if (_rawCount == 0) return;
+            last = RawPointAt(_rawCount - 1);
+            pointsAdded = _pointsAdded;
+            count = incremental
+                ? CopyLatestRawPoints((int)Math.Min(_rawCount, pointsAdded - _plottedThrough))
+                : CopyRawPointsSince(cutoff);
+        }
 
-        _series.Points.Clear();
-        foreach (var (time, value) in filtered)
-            _series.Points.Add(new DataPoint(DateTimeAxis.ToDouble(time), value));
+        if (incremental && !TryUpdateSeries(_scratch, count, cutoff))
+        {
+            lock (_pointsLock)
+            {
+                count = CopyRawPointsSince(cutoff);
+            }
+            incremental = false;
+        }
 
-        if (filtered.Length > 0)
+        if (!incremental)
         {
-            var last = filtered[filtered.Length - 1];
-            CurrentValueText = $"{last.value:F3} {Unit}";
+            _series.Points.Clear();
+            _seriesIncremental = AddPlotPoints(_scratch, count);
         }
+        _plottedThrough = pointsAdded;
+
+        if (last.time >= cutoff)
+            CurrentValueText = last.value.ToString("F3") + _valueSuffix;
 
         // Явно выставляем границы X-оси — это даёт и автопрокрутку,
         // и мгновенное применение при смене диапазона
-        var xAxis = PlotModel.Axes.OfType<DateTimeAxis>().FirstOrDefault();
-        if (xAxis != null)
+        _xAxis.Minimum = DateTimeAxis.ToDouble(cutoff);
+        _xAxis.Maximum = DateTimeAxis.ToDouble(now.AddSeconds(2)); // запас справа
+
+        // Y-ось: сбрасываем в авто, чтобы масштаб подстраивался под видимые данные
+        _yAxis.Minimum = double.NaN;
+        _yAxis.Maximum = double.NaN;
+
+        PlotModel.InvalidatePlot(true);
+        await Task.CompletedTask;
+    }
+
+    /// <summary>
+    /// Сдвигает окно серии без перестройки: убирает точки левее cutoff и дописывает
+    /// count новых точек. Возвращает false, если результат не уложится
+    /// в MaxPlotPoints — тогда нужна полная перестройка с прореживанием.
+    /// </summary>
+    private bool TryUpdateSeries((DateTime time, double value)[] newPoints, int count, DateTime cutoff)
+    {
+        var points = _series.Points;
+
+        var cutoffX = DateTimeAxis.ToDouble(cutoff);
+        var stale = 0;
+        while (stale < points.Count && points[stale].X < cutoffX)
+            stale++;
+
+        if (points.Count - stale + count > MaxPlotPoints)
+            return false;
+
+        if (stale > 0)
+            points.RemoveRange(0, stale);
+
+        for (var i = 0; i < count; i++)
         {
-            xAxis.Minimum = DateTimeAxis.ToDouble(cutoff);
-            xAxis.Maximum = DateTimeAxis.ToDouble(now.AddSeconds(2)); // запас справа
+            var (time, value) = newPoints[i];
+            if (time >= cutoff)
+                points.Add(new DataPoint(DateTimeAxis.ToDouble(time), value));
         }
+        return true;
+    }
 
-        // Y-ось: сбрасываем в авто, чтобы масштаб подстраивался под видимые данные
-        var yAxis = PlotModel.Axes.OfType<LinearAxis>().FirstOrDefault();
-        if (yAxis != null)
+    /// <summary>
+    /// Переносит точки в серию. Если точек больше, чем различимо на графике,
+    /// прореживает их по корзинам min/max: форма кривой и пики сохраняются,
+    /// а отрисовка не зависит от длины истории (режим "Весь" — до 100 000 точек).
+    /// Возвращает true, если точки перенесены без прореживания.
+    /// </summary>
+    private bool AddPlotPoints((DateTime time, double value)[] points, int length)
+    {
+        if (length <= MaxPlotPoints)
         {
-            yAxis.Minimum = double.NaN;
-            yAxis.Maximum = double.NaN;
+            for (var i = 0; i < length; i++)
+                _series.Points.Add(new DataPoint(DateTimeAxis.ToDouble(points[i].time), points[i].value));
+            return true;
         }
 
-        PlotModel.InvalidatePlot(true);
-        await Task.CompletedTask;
+        var bucketCount = MaxPlotPoints / 2;
+        var bucketSize = (length + bucketCount - 1) / bucketCount;
+        var lastAdded = -1;
+
+        for (var start = 0; start < length; start += bucketSize)
+        {
+            var end = Math.Min(start + bucketSize, length);
+            int minIdx = start, maxIdx = start;
+            for (var i = start + 1; i < end; i++)
+            {
+                if (points[i].value < points[minIdx].value) minIdx = i;
+                if (points[i].value > points[maxIdx].value) maxIdx = i;
+            }
+
+            var first = Math.Min(minIdx, maxIdx);
+            var second = Math.Max(minIdx, maxIdx);
+            AddPoint(points[first]);
+            if (second != first)
+                AddPoint(points[second]);
+            lastAdded = second;
+        }
+
+        // Последняя точка всегда видна — по ней пользователь сверяет текущее значение
+        if (lastAdded != length - 1)
+            AddPoint(points[length - 1]);
+        return false;
+
+        void AddPoint((DateTime time, double value) p) =>
+            _series.Points.Add(new DataPoint(DateTimeAxis.ToDouble(p.time), p.value));
     }
 
     private TimeSpan? GetWindowSpan() => SelectedWindow switch
@@ -237,6 +428,6 @@ public partial class ChannelChartViewModel : ObservableObject
     public void Unsubscribe()
     {
         _refreshTimer.Stop();
-        _service.ChannelValueReceived -= OnChannelValue;
+        _service.ChannelValuesReceived -= OnChannelValues;
     }
 }
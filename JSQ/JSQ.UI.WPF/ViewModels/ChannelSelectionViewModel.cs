@@ -8,6 +8,7 @@ using System.Windows;
 using CommunityToolkit.Mvvm.ComponentModel;
 using CommunityToolkit.Mvvm.Input;
 using JSQ.Core.Models;
+using JSQ.Decode;
 
 namespace JSQ.UI.WPF.ViewModels;
 
@@ -17,6 +18,7 @@ namespace JSQ.UI.WPF.ViewModels;
 public partial class ChannelSelectionViewModel : ObservableObject
 {
     private readonly string _presetsPath = Path.Combine(AppDomain.CurrentDomain.BaseDirectory, "channel_presets.json");
+    private static readonly JsonSerializerOptions IndentedJsonOptions = new() { WriteIndented = true };
 
     // Текущий пост, для которого открыт диалог
     public string CurrentPostId { get; private set; } = string.Empty;
@@ -147,7 +149,7 @@ public partial class ChannelSelectionViewModel : ObservableObject
         _channelByIndex.Clear();
         foreach (var ch in AllChannels)
             _channelByIndex[ch.Index] = ch;
-        service.ChannelValueReceived += OnLiveChannelValue;
+        service.ChannelValuesReceived += OnLiveChannelValues;
     }
 
     /// <summary>Отписаться от живых данных (вызывается при закрытии окна).</summary>
@@ -155,19 +157,23 @@ public partial class ChannelSelectionViewModel : ObservableObject
     {
         if (_liveDataService != null)
         {
-            _liveDataService.ChannelValueReceived -= OnLiveChannelValue;
+            _liveDataService.ChannelValuesReceived -= OnLiveChannelValues;
             _liveDataService = null;
         }
     }
 
-    private void OnLiveChannelValue(int index, double value)
+    private void OnLiveChannelValues(IReadOnlyList<ChannelValue> values)
     {
-        if (!_channelByIndex.TryGetValue(index, out var ch))
-            return;
-        Application.Current?.Dispatcher.Invoke(() =>
+        // Один переход в UI-поток на кадр, без ожидания его выполнения
+        Application.Current?.Dispatcher.BeginInvoke(() =>
         {
-            ch.CurrentValue = double.IsNaN(value) ? (double?)null : value;
-            ch.IsActive = !double.IsNaN(value);
+            foreach (var cv in values)
+            {
+                if (!_channelByIndex.TryGetValue(cv.Index, out var ch))
+                    continue;
+                ch.CurrentValue = double.IsNaN(cv.Value) ? (double?)null : cv.Value;
+                ch.IsActive = !double.IsNaN(cv.Value);
+            }
         });
     }
 
@@ -414,7 +420,7 @@ public partial class ChannelSelectionViewModel : ObservableObject
                         HighPrecision = ch.HighPrecision
                     };
             File.WriteAllText(LimitsPath,
-                JsonSerializer.Serialize(dict, new JsonSerializerOptions { WriteIndented = true }));
+                JsonSerializer.Serialize(dict, IndentedJsonOptions));
         }
         catch { }
     }
@@ -453,7 +459,7 @@ public partial class ChannelSelectionViewModel : ObservableObject
 
     private void SaveAllPresets(List<ChannelPreset> presets)
     {
-        var json = JsonSerializer.Serialize(presets, new JsonSerializerOptions { WriteIndented = true });
+        var json = JsonSerializer.Serialize(presets, IndentedJsonOptions);
         File.WriteAllText(_presetsPath, json);
     }
 
@@ -1,5 +1,6 @@
 using System;
 using System.Collections.Generic;
+using System.Diagnostics;
 using System.Linq;
 using System.Threading;
 using System.Threading.Tasks;
@@ -8,7 +9,6 @@ using JSQ.Core.Models;
 using JSQ.Decode;
 using JSQ.Rules;
 using JSQ.Storage;
-using System.Globalization;
 
 namespace JSQ.UI.WPF.ViewModels;
 
@@ -28,6 +28,14 @@ public class ExperimentService : IExperimentService, IDisposable
     // Роутинг: channelIndex → HashSet<postId> (один канал может идти в несколько постов)
     private readonly Dictionary<int, HashSet<string>> _channelPostMap = new();
     private readonly object _stateLock = new();
+    // Неизменяемый снимок роутинга для потока приёма: channelIndex → посты, которые сейчас пишут.
+    // Пересобирается под _stateLock при старте/паузе/возобновлении/остановке поста,
+    // читается без блокировки — приём данных не ждёт UI и цикл здоровья.
+    private volatile Dictionary<int, PostState[]> _activeRoutes = new();
+    // Буферы разбора кадра по постам переиспользуются между кадрами. Кадры идут
+    // последовательно из цикла приёма; лок лишь страхует от наложения при переподключении.
+    private readonly object _frameLock = new();
+    private readonly List<PostState> _framePosts = new();
     private readonly SemaphoreSlim _monitoringLock = new(1, 1);
     private int _suppressAutoReconnect;
 
@@ -46,18 +54,21 @@ public class ExperimentService : IExperimentService, IDisposable
     private static readonly byte[] GoStopPacket = HexToBytes("0000000400150000");
 
     // Соответствие постов бинарным выходам управления (подтверждено двумя ETL).
-    private static readonly Dictionary<string, int> PostDoIndexMap = new(StringComparer.OrdinalIgnoreCase)
+    // Пакеты DOxx ON/OFF неизменны — собираются один раз вместе с записью поста.
+    private static readonly Dictionary<string, PowerOutput> PostPowerOutputs = new(StringComparer.OrdinalIgnoreCase)
     {
-        ["A"] = 1, // DO01
-        ["B"] = 2, // DO02
-        ["C"] = 3  // DO03
+        ["A"] = new PowerOutput(1), // DO01
+        ["B"] = new PowerOutput(2), // DO02
+        ["C"] = new PowerOutput(3)  // DO03
     };
 
     public event Action<SystemHealth>? HealthUpdated;
     public event Action<LogEntry>? LogReceived;
-    public event Action<int, double>? ChannelValueReceived;
+    public event Action<IReadOnlyList<ChannelValue>>? ChannelValuesReceived;
     public event Action<string, AnomalyEvent>? PostAnomalyDetected;
 
+    private static readonly TimeSpan HealthTickInterval = TimeSpan.FromSeconds(1);
+
     private CancellationTokenSource? _healthUpdateCts;
     private Task _initTask = Task.CompletedTask;
     private volatile bool _recoveryDone;
@@ -100,12 +111,31 @@ public class ExperimentService : IExperimentService, IDisposable
         public IAnomalyDetector AnomalyDetector { get; set; } = null!;
         public IAggregationService AggregationService { get; set; } = null!;
         public HashSet<int> ChannelIndices { get; set; } = new();
+        // Сэмплы текущего кадра для этого поста — список живёт всё время записи
+        public List<Sample> FrameSamples { get; } = new();
         public bool IsRunning { get; set; }
         public bool IsPaused { get; set; }
         public int AggregationTick { get; set; }
         public int CheckpointTick { get; set; }
     }
 
+    /// <summary>
+    /// Бинарный выход управления питанием поста с готовыми пакетами включения/выключения.
+    /// </summary>
+    private sealed class PowerOutput
+    {
+        public PowerOutput(int doIndex)
+        {
+            DoIndex = doIndex;
+            OnPacket = BuildDoPacket(doIndex, true);
+            OffPacket = BuildDoPacket(doIndex, false);
+        }
+
+        public int DoIndex { get; }
+        public byte[] OnPacket { get; }
+        public byte[] OffPacket { get; }
+    }
+
     // ─── Публичный API ──────────────────────────────────────────────────────
 
     public void Configure(string host, int port, int timeoutMs)
@@ -340,6 +370,8 @@ public class ExperimentService : IExperimentService, IDisposable
                     _channelPostMap[idx] = set = new HashSet<string>();
                 set.Add(postId);
             }
+
+            PublishRoutesLocked();
         }
 
         if (shouldSendGoStart)
@@ -403,6 +435,7 @@ public class ExperimentService : IExperimentService, IDisposable
 
             state.IsPaused = true;
             state.Experiment.State = ExperimentState.Paused;
+            PublishRoutesLocked();
 
             Task.Run(() => _experimentRepo.UpdateStateAsync(state.Experiment.Id, ExperimentState.Paused));
         }
@@ -426,6 +459,7 @@ public class ExperimentService : IExperimentService, IDisposable
 
             state.IsPaused = false;
             state.Experiment.State = ExperimentState.Running;
+            PublishRoutesLocked();
 
             Task.Run(() => _experimentRepo.UpdateStateAsync(state.Experiment.Id, ExperimentState.Running));
         }
@@ -462,6 +496,7 @@ public class ExperimentService : IExperimentService, IDisposable
                 }
             }
 
+            PublishRoutesLocked();
             shouldSendGoStop = !_postStates.Values.Any(s => s.IsRunning && !s.IsPaused);
         }
 
@@ -545,69 +580,84 @@ public class ExperimentService : IExperimentService, IDisposable
         // Считаем декодированные значения для SamplesPerSecond
         Interlocked.Add(ref _samplesThisWindow, values.Count);
 
-        foreach (var cv in values)
-        {
-            ChannelValueReceived?.Invoke(cv.Index, cv.Value);
-        }
+        // Подписчики получают весь кадр разом, а не по событию на каждый канал
+        ChannelValuesReceived?.Invoke(values);
 
-        // Роутим данные по постам — под локом читаем snapshot, потом работаем
-        List<(string postId, PostState state, List<Sample> samples)>? routes = null;
+        // Роутим данные по постам по опубликованному снимку — без _stateLock
+        var activeRoutes = _activeRoutes;
+        if (activeRoutes.Count == 0) return;
 
-        lock (_stateLock)
+        List<AnomalyEvent>? anomalies = null;
+        lock (_frameLock)
         {
-            if (_postStates.Count == 0) return;
-
-            // Группируем значения по постам (один канал может идти в несколько постов)
-            Dictionary<string, List<Sample>>? bySt = null;
-            foreach (var cv in values)
+            try
             {
-                if (!_channelPostMap.TryGetValue(cv.Index, out var postSet)) continue;
-                double storageValue = double.IsNaN(cv.Value) ? -99.0 : cv.Value;
-                var sample = new Sample(cv.Index, storageValue, cv.Timestamp);
-
-                foreach (var pid in postSet)
+                // Группируем значения по постам (один канал может идти в несколько постов)
+                foreach (var cv in values)
                 {
-                    if (!_postStates.TryGetValue(pid, out var ps)) continue;
-                    if (!ps.IsRunning || ps.IsPaused) continue;
+                    if (!activeRoutes.TryGetValue(cv.Index, out var posts)) continue;
+                    double storageValue = double.IsNaN(cv.Value) ? -99.0 : cv.Value;
+                    var sample = new Sample(cv.Index, storageValue, cv.Timestamp);
 
-                    bySt ??= new Dictionary<string, List<Sample>>();
-                    if (!bySt.TryGetValue(pid, out var list))
+                    foreach (var ps in posts)
                     {
-                        list = new List<Sample>();
-                        bySt[pid] = list;
+                        if (ps.FrameSamples.Count == 0)
+                            _framePosts.Add(ps);
+                        ps.FrameSamples.Add(sample);
                     }
-                    list.Add(sample);
                 }
-            }
 
-            if (bySt == null) return;
+                foreach (var state in _framePosts)
+                {
+                    var postId = state.PostId;
+                    var samples = state.FrameSamples;
 
-            routes = new List<(string, PostState, List<Sample>)>();
-            foreach (var kvp in bySt)
+                    // Запись сырых сэмплов в БД (включая невалидные -99.0 для полноты истории)
+                    _batchWriter.AddSamples(state.Experiment.Id, samples);
+                    state.AggregationService.AddSamples(samples);
+
+                    foreach (var sample in samples)
+                    {
+                        if (sample.IsValid)
+                        {
+                            foreach (var evt in state.AnomalyDetector.CheckValue(sample.ChannelIndex, sample.Value, sample.Timestamp))
+                                FirePostAnomaly(postId, evt, ref anomalies);
+                        }
+                    }
+                }
+            }
+            finally
             {
-                if (_postStates.TryGetValue(kvp.Key, out var ps))
-                    routes.Add((kvp.Key, ps, kvp.Value));
+                foreach (var state in _framePosts)
+                    state.FrameSamples.Clear();
+                _framePosts.Clear();
             }
         }
 
-        if (routes == null) return;
+        SaveAnomalies(anomalies);
+    }
 
-        foreach (var (postId, state, samples) in routes)
+    /// <summary>
+    /// Пересобирает снимок роутинга из _channelPostMap и состояний постов.
+    /// Вызывается только под _stateLock.
+    /// </summary>
+    private void PublishRoutesLocked()
+    {
+        var routes = new Dictionary<int, PostState[]>(_channelPostMap.Count);
+        var active = new List<PostState>();
+        foreach (var kvp in _channelPostMap)
         {
-            // Запись сырых сэмплов в БД (включая невалидные -99.0 для полноты истории)
-            _batchWriter.AddSamples(state.Experiment.Id, samples);
-
-            foreach (var sample in samples)
+            active.Clear();
+            foreach (var pid in kvp.Value)
             {
-                state.AggregationService.AddSample(sample);
-
-                if (sample.IsValid)
-                {
-                    foreach (var evt in state.AnomalyDetector.CheckValue(sample.ChannelIndex, sample.Value, sample.Timestamp))
-                        FirePostAnomaly(postId, state, evt);
-                }
+                if (_postStates.TryGetValue(pid, out var ps) && ps.IsRunning && !ps.IsPaused)
+                    active.Add(ps);
             }
+            if (active.Count > 0)
+                routes[kvp.Key] = active.ToArray();
         }
+
+        _activeRoutes = routes;
     }
 
     private void OnStatusChanged(object sender, ConnectionStatus status)
@@ -649,18 +699,23 @@ public class ExperimentService : IExperimentService, IDisposable
         _healthUpdateCts = new CancellationTokenSource();
         Task.Run(async () =>
         {
+            // Тики идут по монотонному дедлайну: время работы тика не добавляется к секунде,
+            // и счётчики агрегатов/чекпоинтов не отстают от реального времени
+            var clock = Stopwatch.StartNew();
+            var deadline = TimeSpan.Zero;
+
             while (!_healthUpdateCts.Token.IsCancellationRequested)
             {
                 try { UpdateHealth(); } catch { }
-                try { await ProcessAggregatesAsync(); } catch { }
-
-                await Task.Delay(1000, _healthUpdateCts.Token).ConfigureAwait(false);
 
-                // Чекпоинт каждые 30 секунд
+                // Один снимок активных постов на тик — общий для агрегатов и чекпоинтов
                 List<PostState> running;
                 lock (_stateLock)
                     running = _postStates.Values.Where(s => s.IsRunning && !s.IsPaused).ToList();
 
+                try { await ProcessAggregatesAsync(running); } catch { }
+
+                // Чекпоинт каждые 30 секунд
                 foreach (var state in running)
                 {
                     state.CheckpointTick++;
@@ -670,6 +725,13 @@ public class ExperimentService : IExperimentService, IDisposable
                         try { await SaveCheckpointAsync(state); } catch { }
                     }
                 }
+
+                deadline += HealthTickInterval;
+                var wait = deadline - clock.Elapsed;
+                if (wait > TimeSpan.Zero)
+                    await Task.Delay(wait, _healthUpdateCts.Token).ConfigureAwait(false);
+                else
+                    deadline = clock.Elapsed; // тик затянулся — не догоняем пропущенное пачкой
             }
         }, _healthUpdateCts.Token);
     }
@@ -694,12 +756,9 @@ public class ExperimentService : IExperimentService, IDisposable
         HealthUpdated?.Invoke(health);
     }
 
-    private async Task ProcessAggregatesAsync()
+    private async Task ProcessAggregatesAsync(List<PostState> active)
     {
-        List<PostState> active;
-        lock (_stateLock)
-            active = _postStates.Values.Where(s => s.IsRunning && !s.IsPaused).ToList();
-
+        List<AnomalyEvent>? anomalies = null;
         foreach (var state in active)
         {
             state.AggregationTick++;
@@ -711,7 +770,7 @@ public class ExperimentService : IExperimentService, IDisposable
             foreach (var agg in readyAggregates)
             {
                 foreach (var evt in state.AnomalyDetector.CheckAggregate(agg))
-                    FirePostAnomaly(state.PostId, state, evt);
+                    FirePostAnomaly(state.PostId, evt, ref anomalies);
             }
 
             if (readyAggregates.Count > 0)
@@ -720,8 +779,10 @@ public class ExperimentService : IExperimentService, IDisposable
             }
 
             foreach (var evt in state.AnomalyDetector.CheckTimeouts(JsqClock.Now))
-                FirePostAnomaly(state.PostId, state, evt);
+                FirePostAnomaly(state.PostId, evt, ref anomalies);
         }
+
+        SaveAnomalies(anomalies);
     }
 
     private async Task SaveCheckpointAsync(PostState state)
@@ -737,14 +798,26 @@ public class ExperimentService : IExperimentService, IDisposable
     // ─── Вспомогательные методы ─────────────────────────────────────────────
 
     /// <summary>
-    /// Пробрасывает событие аномалии в UI и сохраняет в БД.
+    /// Пробрасывает событие аномалии в UI и откладывает его в пачку для сохранения в БД.
     /// </summary>
-    private void FirePostAnomaly(string postId, PostState state, AnomalyEvent evt)
+    private void FirePostAnomaly(string postId, AnomalyEvent evt, ref List<AnomalyEvent>? pending)
     {
         PostAnomalyDetected?.Invoke(postId, evt);
+        (pending ??= new List<AnomalyEvent>()).Add(evt);
+    }
+
+    /// <summary>
+    /// Сохраняет накопленные за кадр или тик события одной транзакцией.
+    /// При обрыве потока NoData приходит по всем каналам поста сразу —
+    /// это одна запись в БД вместо отдельного соединения на каждый канал.
+    /// </summary>
+    private void SaveAnomalies(List<AnomalyEvent>? pending)
+    {
+        if (pending == null) return;
+
         _ = Task.Run(async () =>
         {
-            try { await _experimentRepo.SaveAnomalyEventAsync(evt); }
+            try { await _experimentRepo.SaveAnomalyEventsAsync(pending); }
             catch { }
         });
     }
@@ -778,7 +851,7 @@ public class ExperimentService : IExperimentService, IDisposable
 
     private async Task<bool> SendPostPowerCommandAsync(string postId, bool enable, CancellationToken ct = default)
     {
-        if (!PostDoIndexMap.TryGetValue(postId, out var doIndex))
+        if (!PostPowerOutputs.TryGetValue(postId, out var output))
         {
             LogReceived?.Invoke(new LogEntry
             {
@@ -791,14 +864,14 @@ public class ExperimentService : IExperimentService, IDisposable
             return false;
         }
 
-        var packet = BuildDoPacket(doIndex, enable);
+        var packet = enable ? output.OnPacket : output.OffPacket;
         var stateLabel = enable ? "ON" : "OFF";
 
         return await SendBinaryPacketAsync(
             packet,
             source: "Power",
             postId: postId,
-            successMessage: $"Отправлена команда розетки поста {postId}: DO{doIndex:D2} {stateLabel}",
+            successMessage: $"Отправлена команда розетки поста {postId}: DO{output.DoIndex:D2} {stateLabel}",
             failureMessage: $"Не удалось переключить розетку поста {postId}",
             ct: ct);
     }
@@ -887,15 +960,20 @@ public class ExperimentService : IExperimentService, IDisposable
         var bytes = new byte[hex.Length / 2];
         for (var i = 0; i < bytes.Length; i++)
         {
-            bytes[i] = byte.Parse(
-                hex.Substring(i * 2, 2),
-                NumberStyles.HexNumber,
-                CultureInfo.InvariantCulture);
+            bytes[i] = (byte)((HexNibble(hex[i * 2]) << 4) | HexNibble(hex[i * 2 + 1]));
         }
 
         return bytes;
     }
 
+    private static int HexNibble(char c)
+    {
+        if (c >= '0' && c <= '9') return c - '0';
+        if (c >= 'A' && c <= 'F') return c - 'A' + 10;
+        if (c >= 'a' && c <= 'f') return c - 'a' + 10;
+        throw new FormatException($"Invalid hex character '{c}'");
+    }
+
     public async Task<List<ChannelEventRecord>> GetExperimentEventsAsync(string experimentId)
     {
         try
@@ -903,7 +981,7 @@ public class ExperimentService : IExperimentService, IDisposable
             var records = await _experimentRepo.GetAnomalyEventsAsync(experimentId);
             return records.Select(r =>
             {
-                DateTime.TryParse(r.Timestamp, null, DateTimeStyles.RoundtripKind, out var ts);
+                JsqClock.TryParseStored(r.Timestamp, out var ts);
                 return new ChannelEventRecord
                 {
                     Timestamp = ts,
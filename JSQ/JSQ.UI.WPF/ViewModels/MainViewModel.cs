@@ -13,6 +13,7 @@ using Microsoft.Win32;
 using CommunityToolkit.Mvvm.ComponentModel;
 using CommunityToolkit.Mvvm.Input;
 using JSQ.Core.Models;
+using JSQ.Decode;
 using JSQ.Export;
 using JSQ.Storage;
 using JSQ.UI.WPF.Services.AutoUpdate;
@@ -91,7 +92,10 @@ public partial class MainViewModel : ObservableObject
     [NotifyPropertyChangedFor(nameof(HasUpdatePrompt))]
     private string _updatePromptMessage = string.Empty;
 
-    public string AppVersionText => $"JSQ v{ResolveAppVersion()}";
+    // Версия сборки за время работы не меняется — атрибуты читаются один раз
+    private static readonly string CachedAppVersionText = $"JSQ v{ResolveAppVersion()}";
+
+    public string AppVersionText => CachedAppVersionText;
 
     public bool HasUpdatePrompt => !string.IsNullOrWhiteSpace(UpdatePromptMessage);
 
@@ -135,7 +139,7 @@ public partial class MainViewModel : ObservableObject
 
         _experimentService.HealthUpdated += OnHealthUpdated;
         _experimentService.LogReceived += OnLogReceived;
-        _experimentService.ChannelValueReceived += OnChannelValueReceived;
+        _experimentService.ChannelValuesReceived += OnChannelValuesReceived;
         _experimentService.PostAnomalyDetected += OnPostAnomalyDetected;
 
         _staleChannelTimer = new DispatcherTimer { Interval = TimeSpan.FromSeconds(2) };
@@ -205,7 +209,7 @@ public partial class MainViewModel : ObservableObject
 
     private void OnAutoUpdateStatusChanged(AutoUpdateStatus status)
     {
-        Application.Current.Dispatcher.Invoke(() =>
+        Application.Current.Dispatcher.BeginInvoke(() =>
         {
             UpdatePromptMessage = status.Message;
         });
@@ -850,13 +854,36 @@ public partial class MainViewModel : ObservableObject
         var filtered = GetPostFiltered(postId);
         var search = GetPostSearch(postId);
 
-        filtered.Clear();
+        // Приводим отфильтрованный список к нужному виду точечными правками вместо Clear():
+        // строки, которые остаются видимыми, не пересоздаются в DataGrid
+        var target = 0;
         foreach (var ch in source)
         {
-            if (string.IsNullOrWhiteSpace(search) ||
-                ch.Alias.IndexOf(search, StringComparison.OrdinalIgnoreCase) >= 0)
-                filtered.Add(ch);
+            if (!string.IsNullOrWhiteSpace(search) &&
+                ch.Alias.IndexOf(search, StringComparison.OrdinalIgnoreCase) < 0)
+                continue;
+
+            if (target < filtered.Count && ReferenceEquals(filtered[target], ch))
+            {
+                target++;
+                continue;
+            }
+
+            var existing = -1;
+            for (var i = target + 1; i < filtered.Count; i++)
+            {
+                if (ReferenceEquals(filtered[i], ch)) { existing = i; break; }
+            }
+
+            if (existing >= 0)
+                filtered.Move(existing, target);
+            else
+                filtered.Insert(target, ch);
+            target++;
         }
+
+        while (filtered.Count > target)
+            filtered.RemoveAt(filtered.Count - 1);
     }
 
     // --- Helpers ---
@@ -893,6 +920,35 @@ public partial class MainViewModel : ObservableObject
         _ => PostA
     };
 
+    private PostRunningFlags CapturePostRunning() =>
+        new(PostA.IsRunning, PostB.IsRunning, PostC.IsRunning);
+
+    /// <summary>
+    /// Признак записи по каждому посту, снятый один раз на кадр/тик —
+    /// циклы по каналам не обращаются к монитору поста для каждой строки.
+    /// </summary>
+    private readonly struct PostRunningFlags
+    {
+        private readonly bool _a;
+        private readonly bool _b;
+        private readonly bool _c;
+
+        public PostRunningFlags(bool a, bool b, bool c)
+        {
+            _a = a;
+            _b = b;
+            _c = c;
+        }
+
+        // Неизвестный пост трактуется как A — так же, как в GetPostMonitor
+        public bool For(string postId) => postId switch
+        {
+            "B" => _b,
+            "C" => _c,
+            _ => _a
+        };
+    }
+
     // --- Назначение каналов на пост ---
 
     private void AssignChannelsToPost(string postId, IList<int> newIndices)
@@ -1245,50 +1301,61 @@ public partial class MainViewModel : ObservableObject
 
     // --- Обработчики событий от сервиса ---
 
-    private void OnChannelValueReceived(int index, double value)
+    private void OnChannelValuesReceived(IReadOnlyList<ChannelValue> values)
     {
+        // Один переход в UI-поток на кадр, а не на каждое из ~134 значений
         Application.Current.Dispatcher.BeginInvoke(() =>
         {
-            if (!_channelMap.TryGetValue(index, out var statuses)) return;
+            var now = JsqClock.Now;
+            var running = CapturePostRunning();
+            foreach (var cv in values)
+                ApplyChannelValue(cv.Index, cv.Value, now, running);
+        });
+    }
 
-            ChannelRegistry.All.TryGetValue(index, out var def);
+    private void ApplyChannelValue(int index, double value, DateTime now, PostRunningFlags running)
+    {
+        if (!_channelMap.TryGetValue(index, out var statuses)) return;
 
-            foreach (var ch in statuses)
-            {
-                ch.CurrentValue = double.IsNaN(value) ? (double?)null : value;
-                ch.LastUpdateTime = JsqClock.Now;
+        ChannelRegistry.All.TryGetValue(index, out var def);
+
+        foreach (var ch in statuses)
+        {
+            ch.CurrentValue = double.IsNaN(value) ? (double?)null : value;
+            ch.LastUpdateTime = now;
 
-                if (double.IsNaN(value))
+            if (double.IsNaN(value))
+            {
+                // Некорректное значение в потоке — нет данных
+                ch.Status = HealthStatus.NoData;
+            }
+            else
+            {
+                // Данные пришли — канал живой
+                var isRunning = running.For(ch.Post);
+                ch.IsRecording = isRunning;
+
+                if (isRunning &&
+                    def != null &&
+                    ((def.MinLimit.HasValue && value < def.MinLimit.Value) ||
+                     (def.MaxLimit.HasValue && value > def.MaxLimit.Value)))
                 {
-                    // Некорректное значение в потоке — нет данных
-                    ch.Status = HealthStatus.NoData;
+                    ch.Status = HealthStatus.Warning;
                 }
-                else
+                else if (ch.Status != HealthStatus.Alarm)
                 {
-                    // Данные пришли — канал живой
-                    var monitor = GetPostMonitor(ch.Post);
-                    ch.IsRecording = monitor.IsRunning;
-
-                    if (monitor.IsRunning &&
-                        def != null &&
-                        ((def.MinLimit.HasValue && value < def.MinLimit.Value) ||
-                         (def.MaxLimit.HasValue && value > def.MaxLimit.Value)))
-                    {
-                        ch.Status = HealthStatus.Warning;
-                    }
-                    else if (ch.Status != HealthStatus.Alarm)
-                    {
-                        // Не сбрасываем Alarm — его снимает только DataRestored
-                        ch.Status = HealthStatus.OK;  // данные идут → канал живой
-                    }
+                    // Не сбрасываем Alarm — его снимает только DataRestored
+                    ch.Status = HealthStatus.OK;  // данные идут → канал живой
                 }
             }
-        });
+        }
     }
 
     private void OnPostAnomalyDetected(string postId, AnomalyEvent evt)
     {
-        Application.Current.Dispatcher.Invoke(() =>
+        // Событие приходит из цикла приёма: ставим обработку в очередь UI-потока,
+        // а не ждём её завершения, иначе отрисовка лога тормозит приём кадров
+        Application.Current.Dispatcher.BeginInvoke(() =>
         {
             var monitor = GetPostMonitor(postId);
             string level;
@@ -1297,7 +1364,7 @@ public partial class MainViewModel : ObservableObject
             {
                 // Восстановление — не аномалия, логируем Info/зелёный
                 level = "Info";
-                // Явно снимаем Alarm: OnChannelValueReceived не трогает Alarm-статус
+                // Явно снимаем Alarm: ApplyChannelValue не трогает Alarm-статус
                 if (_channelMap.TryGetValue(evt.ChannelIndex, out var restoredStatuses))
                 {
                     var ch = restoredStatuses.FirstOrDefault(s => s.Post == postId) ?? restoredStatuses.FirstOrDefault();
@@ -1370,11 +1437,12 @@ public partial class MainViewModel : ObservableObject
         // Сами оповещения генерирует AnomalyDetector.CheckTimeouts (через 10 сек),
         // а не этот таймер — чтобы исключить ложные срабатывания при паузах потока.
         var now = JsqClock.Now;
+        var running = CapturePostRunning();
         foreach (var statuses in _channelMap.Values)
         {
             foreach (var ch in statuses)
             {
-                var isRunning = !string.IsNullOrEmpty(ch.Post) && GetPostMonitor(ch.Post).IsRunning;
+                var isRunning = !string.IsNullOrEmpty(ch.Post) && running.For(ch.Post);
                 var isStale = AlertStatusPolicy.IsStale(ch.LastUpdateTime, now, StaleDataThreshold);
 
                 if (!isRunning)
@@ -1444,7 +1512,7 @@ public partial class MainViewModel : ObservableObject
 
     private void OnLogReceived(LogEntry entry)
     {
-        Application.Current.Dispatcher.Invoke(() =>
+        Application.Current.Dispatcher.BeginInvoke(() =>
         {
             LogEntries.Insert(0, entry);
             while (LogEntries.Count > 1000)
@@ -1472,7 +1540,13 @@ public interface IExperimentService
 {
     event Action<SystemHealth> HealthUpdated;
     event Action<LogEntry> LogReceived;
-    event Action<int, double>? ChannelValueReceived;
+
+    /// <summary>
+    /// Значения каналов одного декодированного кадра (NaN — нет данных).
+    /// Вызывается из потока приёма.
+    /// </summary>
+    event Action<IReadOnlyList<ChannelValue>>? ChannelValuesReceived;
+
     event Action<string, AnomalyEvent>? PostAnomalyDetected;
 
     void Configure(string host, int port, int timeoutMs);
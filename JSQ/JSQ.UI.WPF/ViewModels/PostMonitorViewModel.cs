@@ -60,9 +60,10 @@ public partial class PostMonitorViewModel : ObservableObject
         _                       => "○ Свободен"
     };
 
-    private static readonly SolidColorBrush _brushRunning = new(Color.FromRgb(0x4C, 0xAF, 0x50));
-    private static readonly SolidColorBrush _brushPaused  = new(Color.FromRgb(0xFF, 0x98, 0x00));
-    private static readonly SolidColorBrush _brushIdle    = new(Color.FromRgb(0x9E, 0x9E, 0x9E));
+    // Кисти общие для всех постов и потоков — замораживаем, чтобы WPF не отслеживал их изменения
+    private static readonly SolidColorBrush _brushRunning = Freeze(0x4C, 0xAF, 0x50);
+    private static readonly SolidColorBrush _brushPaused  = Freeze(0xFF, 0x98, 0x00);
+    private static readonly SolidColorBrush _brushIdle    = Freeze(0x9E, 0x9E, 0x9E);
 
     public SolidColorBrush StateBrush => State switch
     {
@@ -83,4 +84,11 @@ public partial class PostMonitorViewModel : ObservableObject
 
     public bool CanStart => State == ExperimentState.Idle;
     public bool CanStop  => State == ExperimentState.Running || State == ExperimentState.Paused;
+
+    private static SolidColorBrush Freeze(byte r, byte g, byte b)
+    {
+        var brush = new SolidColorBrush(Color.FromRgb(r, g, b));
+        brush.Freeze();
+        return brush;
+    }
 }
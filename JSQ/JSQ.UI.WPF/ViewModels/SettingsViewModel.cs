@@ -13,6 +13,7 @@ public partial class SettingsViewModel : ObservableObject
 {
     private static readonly string SettingsFile =
         Path.Combine(AppDomain.CurrentDomain.BaseDirectory, "app_settings.json");
+    private static readonly JsonSerializerOptions IndentedJsonOptions = new() { WriteIndented = true };
 
     [ObservableProperty]
     private string _transmitterHost = "192.168.0.214";
@@ -139,7 +140,7 @@ public partial class SettingsViewModel : ObservableObject
                 UpdateFeedPath = UpdateFeedPath,
                 UpdateCheckIntervalMinutes = UpdateCheckIntervalMinutes
             };
-            var json = JsonSerializer.Serialize(dto, new JsonSerializerOptions { WriteIndented = true });
+            var json = JsonSerializer.Serialize(dto, IndentedJsonOptions);
             File.WriteAllText(SettingsFile, json);
         }
         catch